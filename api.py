@@ -0,0 +1,424 @@
+#!/usr/bin/env python3
+"""
+Video Transcription Tool - Local HTTP API
+Submit videos, poll job progress and fetch transcripts from other services
+
+Endpoints:
+    POST   /jobs?name=talk.mp4&language=ar-SA   raw video or audio bytes as the body -> 202 {"id": ...}
+    GET    /jobs/<id>                           status, progress and warnings
+    GET    /jobs/<id>/transcript.<txt|srt|vtt|json>
+    DELETE /jobs/<id>                           forget a finished job
+    GET    /health, /metrics
+
+A full queue answers 429 with Retry-After. Runs offline with --backend fake or vosk:
+
+    python api.py --port 8600 --backend fake
+    curl --data-binary @talk.mp4 "http://127.0.0.1:8600/jobs?name=talk.mp4"
+"""
+
+import argparse
+import json
+import os
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from backends import BACKENDS, DEFAULT_BACKEND, BackendError, RecognizerBackend, get_backend
+from cache import TranscriptCache
+from jobs import DEFAULT_MAX_JOBS, Job, JobManager, QueueFullError
+from metrics import REGISTRY, Metrics
+from subtitles import create_srt_content, create_vtt_content
+from transcriber import (COPY_BUFFER_SIZE, DEFAULT_MAX_WORKERS, DEFAULT_REQUESTS_PER_SECOND, MAX_WORKERS_LIMIT,
+                         SCRATCH_DIR, SUPPORTED_FORMATS, SUPPORTED_LANGUAGES, Transcript, create_json_content,
+                         transcribe_file)
+
+DEFAULT_API_PORT = int(os.environ.get("TRANSCRIBE_API_PORT", "8600"))
+DEFAULT_MAX_QUEUED = 8
+# Largest accepted upload; bodies are streamed to disk, so this bounds disk rather than memory
+MAX_UPLOAD_SIZE = int(os.environ.get("TRANSCRIBE_API_MAX_UPLOAD", 4 * 1024 * 1024 * 1024))
+# Seconds a client is told to wait after a 429
+RETRY_AFTER_SECONDS = 5
+# Seconds an idle keep-alive connection or a stalled upload is kept open
+KEEPALIVE_TIMEOUT = 60
+
+
+def run_api_job(video_path: str, language, chunk_duration: int, backend: RecognizerBackend,
+                progress_callback=None, warning_callback=None, partial_callback=None, **options) -> dict:
+    """Job body: transcribe an uploaded file, then delete it"""
+    try:
+        with REGISTRY.track(Metrics()) as metrics:
+            transcript = transcribe_file(video_path, language, chunk_duration, progress_callback,
+                                         backend=backend, warning_callback=warning_callback,
+                                         segment_callback=partial_callback, metrics=metrics, **options)
+    finally:
+        try:
+            os.unlink(video_path)
+        except OSError:
+            pass
+
+    return {
+        "language": language,
+        "backend": backend.name,
+        "chunk_duration": chunk_duration,
+        "transcript": transcript.text,
+        "segments": transcript.segments,
+        "failed": transcript.failed,
+        "skipped": transcript.skipped,
+        "metrics": metrics.snapshot(),
+    }
+
+
+class TranscriptionService:
+    """Job pool, shared backends and cache behind the HTTP handler"""
+
+    def __init__(self, manager: JobManager, default_backend: str = DEFAULT_BACKEND,
+                 cache: Optional[TranscriptCache] = None, max_workers: int = DEFAULT_MAX_WORKERS,
+                 requests_per_second: float = DEFAULT_REQUESTS_PER_SECOND):
+        self.manager = manager
+        self.default_backend = default_backend
+        self.cache = cache
+        self.max_workers = max_workers
+        self.requests_per_second = requests_per_second
+        self._backends: Dict[str, RecognizerBackend] = {}
+        self._backends_lock = threading.Lock()
+
+    def get_backend(self, name: str) -> RecognizerBackend:
+        """Create each backend once and share it between jobs"""
+        with self._backends_lock:
+            if name not in self._backends:
+                self._backends[name] = get_backend(name)
+            return self._backends[name]
+
+    def job_options(self, query: Dict[str, list]) -> dict:
+        """Validated transcription options from the query string; raises ValueError"""
+        def first(key, default):
+            return query.get(key, [default])[0]
+
+        languages = query.get("language", ["ar-SA"])
+        unknown = [language for language in languages if language not in SUPPORTED_LANGUAGES]
+        if unknown:
+            raise ValueError(f"unsupported language: {', '.join(unknown)}")
+
+        backend_name = first("backend", self.default_backend)
+        if backend_name not in BACKENDS:
+            raise ValueError(f"unknown backend: {backend_name}")
+
+        chunk_duration = int(first("chunk_duration", "30"))
+        if not 5 <= chunk_duration <= 60:
+            raise ValueError("chunk_duration must be between 5 and 60 seconds")
+
+        overlap = float(first("overlap", "0"))
+        if not 0 <= overlap < chunk_duration:
+            raise ValueError("overlap must be at least 0 and less than chunk_duration")
+
+        return {
+            "language": languages[0] if len(languages) == 1 else languages,
+            "chunk_duration": chunk_duration,
+            "backend": backend_name,
+            "overlap": overlap,
+            "speech_filter": first("speech_filter", "1") not in ("0", "false", "no"),
+            "streaming": first("streaming", "1") not in ("0", "false", "no"),
+            "max_workers": max(1, min(int(first("workers", str(self.max_workers))), MAX_WORKERS_LIMIT)),
+            "requests_per_second": self.requests_per_second,
+        }
+
+
+def job_status(job: Job) -> dict:
+    status = {
+        "id": job.id,
+        "name": job.name,
+        "status": job.status,
+        "progress": job.progress,
+        "message": job.message,
+        "chunks_done": len(job.partial),
+        "warnings": job.warnings,
+        "error": job.error,
+        "created_at": job.created_at,
+        "started_at": job.started_at,
+        "finished_at": job.finished_at,
+    }
+    if job.status == Job.DONE:
+        status["words"] = len(job.result["transcript"].split())
+        status["failed_chunks"] = len(job.result["failed"])
+        status["skipped_chunks"] = len(job.result["skipped"])
+    return status
+
+
+def render_result(job: Job, fmt: str) -> Optional[str]:
+    """A finished job's transcript in one output format, or None for an unknown format"""
+    result = job.result
+    if fmt == "txt":
+        return result["transcript"]
+    if fmt == "srt":
+        return create_srt_content(result["segments"])
+    if fmt == "vtt":
+        return create_vtt_content(result["segments"])
+    if fmt == "json":
+        transcript = Transcript(result["transcript"], result["segments"], result["failed"], result["skipped"])
+        return create_json_content(transcript, job.name, result["language"], result["backend"],
+                                   result["chunk_duration"], job.warnings, job.finished_at - job.started_at,
+                                   result["metrics"])
+    return None
+
+
+CONTENT_TYPES = {
+    "txt": "text/plain; charset=utf-8",
+    "srt": "application/x-subrip; charset=utf-8",
+    "vtt": "text/vtt; charset=utf-8",
+    "json": "application/json; charset=utf-8",
+}
+
+
+class RequestError(Exception):
+    """Raised with the status, message and headers a request is refused with"""
+
+    def __init__(self, status: int, message: str, headers: Optional[dict] = None):
+        super().__init__(message)
+        self.status = status
+        self.headers = headers or {}
+
+
+class ApiHandler(BaseHTTPRequestHandler):
+    """Routes requests to the TranscriptionService on self.server.service
+
+    Speaks HTTP/1.1 so clients that send Expect: 100-continue get a refusal
+    before uploading anything.
+    """
+
+    protocol_version = "HTTP/1.1"
+    # Idle keep-alive connections and stalled uploads are dropped after this many seconds
+    timeout = KEEPALIVE_TIMEOUT
+
+    @property
+    def service(self) -> TranscriptionService:
+        return self.server.service
+
+    def send_body(self, status: int, body: str, content_type: str, headers: Optional[dict] = None):
+        data = body.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        if self.close_connection:
+            self.send_header("Connection", "close")
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(data)
+
+    def send_json(self, status: int, payload: dict, headers: Optional[dict] = None):
+        self.send_body(status, json.dumps(payload, ensure_ascii=False), CONTENT_TYPES["json"], headers)
+
+    def send_error_json(self, status: int, message: str, headers: Optional[dict] = None):
+        self.send_json(status, {"error": message}, headers)
+
+    def route(self):
+        """(path parts, query) of the request"""
+        url = urlsplit(self.path)
+        return [part for part in url.path.split("/") if part], parse_qs(url.query)
+
+    def do_GET(self):
+        parts, query = self.route()
+        if parts == ["health"]:
+            self.send_json(200, {"status": "ok", "queued": self.service.manager.queue_depth,
+                                 "running": self.service.manager.running})
+        elif parts == ["metrics"]:
+            self.send_body(200, REGISTRY.to_prometheus(), "text/plain; version=0.0.4")
+        elif len(parts) in (2, 3) and parts[0] == "jobs":
+            job = self.service.manager.get(parts[1])
+            if job is None:
+                self.send_error_json(404, "unknown job")
+            elif len(parts) == 2:
+                self.send_json(200, job_status(job))
+            else:
+                self.send_transcript(job, parts[2])
+        else:
+            self.send_error_json(404, "not found")
+
+    def send_transcript(self, job: Job, filename: str):
+        stem, _, fmt = filename.partition(".")
+        if stem != "transcript" or fmt not in CONTENT_TYPES:
+            self.send_error_json(404, "expected transcript.txt, .srt, .vtt or .json")
+        elif job.status == Job.FAILED:
+            self.send_error_json(409, job.error or "job failed")
+        elif job.status != Job.DONE:
+            self.send_error_json(409, f"job is {job.status}", {"Retry-After": str(RETRY_AFTER_SECONDS)})
+        else:
+            self.send_body(200, render_result(job, fmt), CONTENT_TYPES[fmt])
+
+    def do_POST(self):
+        try:
+            name, suffix, options, backend, length = self.check_upload()
+        except RequestError as e:
+            self.refuse_upload(e)
+            return
+
+        video_path = self.receive_upload(length, suffix)
+        if video_path is None:
+            return
+
+        try:
+            job_id = self.service.manager.submit(name, run_api_job, video_path, cache=self.service.cache,
+                                                 backend=backend, **options)
+        except QueueFullError:
+            os.unlink(video_path)
+            self.send_error_json(429, "queue is full", {"Retry-After": str(RETRY_AFTER_SECONDS)})
+            return
+
+        self.send_json(202, {"id": job_id, "status": Job.QUEUED}, {"Location": f"/jobs/{job_id}"})
+
+    def check_upload(self) -> Tuple[str, str, dict, RecognizerBackend, int]:
+        """Name, suffix, options, backend and body length of a POST /jobs; raises RequestError"""
+        parts, query = self.route()
+        if parts != ["jobs"]:
+            raise RequestError(404, "not found")
+
+        manager = self.service.manager
+        if manager.max_queued and manager.queue_depth >= manager.max_queued:
+            raise RequestError(429, "queue is full", {"Retry-After": str(RETRY_AFTER_SECONDS)})
+
+        name = os.path.basename(query.get("name", ["upload.mp4"])[0])
+        suffix = os.path.splitext(name)[1].lower()
+        if suffix not in SUPPORTED_FORMATS:
+            raise RequestError(415, f"unsupported format: {suffix or name}")
+
+        try:
+            options = self.service.job_options(query)
+            backend = self.service.get_backend(options.pop("backend"))
+        except (ValueError, BackendError) as e:
+            raise RequestError(400, str(e))
+
+        if self.headers.get("Content-Length") is None:
+            raise RequestError(411, "Content-Length required")
+        length = self.content_length()
+        if length is None:
+            raise RequestError(400, "invalid Content-Length")
+        if length > MAX_UPLOAD_SIZE:
+            raise RequestError(413, f"upload larger than {MAX_UPLOAD_SIZE} bytes")
+        return name, suffix, options, backend, length
+
+    def content_length(self) -> Optional[int]:
+        """The request's Content-Length, or None when missing or malformed"""
+        try:
+            length = int(self.headers.get("Content-Length", ""))
+        except ValueError:
+            return None
+        return length if length >= 0 else None
+
+    def handle_expect_100(self):
+        # Refuse an upload before the client starts sending it
+        if self.command == "POST":
+            try:
+                self.check_upload()
+            except RequestError as e:
+                self.close_connection = True
+                self.send_error_json(e.status, str(e), e.headers)
+                return False
+        return super().handle_expect_100()
+
+    def refuse_upload(self, error: RequestError):
+        """Reply to a POST whose body will not be kept
+
+        A client that is already sending may not read the reply until its
+        body is sent, and closing on unread data resets the connection, so
+        a body no larger than an accepted upload is read and dropped first.
+        Bodies of unknown or excessive length close the connection instead.
+        """
+        length = self.content_length()
+        if length is None or length > MAX_UPLOAD_SIZE or not self.discard_body(length):
+            self.close_connection = True
+        self.send_error_json(error.status, str(error), error.headers)
+
+    def discard_body(self, length: int) -> bool:
+        """Read and drop length bytes of request body; False if the client went away"""
+        remaining = length
+        try:
+            while remaining:
+                block = self.rfile.read(min(COPY_BUFFER_SIZE, remaining))
+                if not block:
+                    return False
+                remaining -= len(block)
+        except OSError:
+            return False
+        return True
+
+    def receive_upload(self, length: int, suffix: str) -> Optional[str]:
+        """Stream the request body to the scratch directory in blocks, returning its path"""
+        with tempfile.NamedTemporaryFile(delete=False, suffix=suffix, dir=SCRATCH_DIR) as f:
+            remaining = length
+            try:
+                while remaining:
+                    block = self.rfile.read(min(COPY_BUFFER_SIZE, remaining))
+                    if not block:
+                        raise ConnectionError("upload ended early")
+                    f.write(block)
+                    remaining -= len(block)
+            except (OSError, ConnectionError) as e:
+                f.close()
+                os.unlink(f.name)
+                self.close_connection = True
+                self.send_error_json(400, f"upload failed: {e}")
+                return None
+        return f.name
+
+    def do_DELETE(self):
+        parts, _ = self.route()
+        job = self.service.manager.get(parts[1]) if len(parts) == 2 and parts[0] == "jobs" else None
+        if job is None:
+            self.send_error_json(404, "unknown job")
+        elif not self.service.manager.remove(job.id):
+            self.send_error_json(409, f"job is {job.status}")
+        else:
+            self.send_json(200, {"id": job.id, "removed": True})
+
+    def log_message(self, format, *args):
+        pass
+
+
+def create_server(service: TranscriptionService, host: str = "127.0.0.1",
+                  port: int = DEFAULT_API_PORT) -> ThreadingHTTPServer:
+    """HTTP server for service; call serve_forever() to run it"""
+    server = ThreadingHTTPServer((host, port), ApiHandler)
+    server.daemon_threads = True
+    server.service = service
+    return server
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1", help="interface to listen on")
+    parser.add_argument("--port", type=int, default=DEFAULT_API_PORT)
+    parser.add_argument("-b", "--backend", default=DEFAULT_BACKEND, choices=list(BACKENDS.keys()),
+                        help="backend used when a request does not name one")
+    parser.add_argument("-j", "--jobs", type=int, default=DEFAULT_MAX_JOBS, help="files transcribed at once")
+    parser.add_argument("--max-queued", type=int, default=DEFAULT_MAX_QUEUED,
+                        help="jobs allowed to wait before new uploads get 429 (0 = unlimited)")
+    parser.add_argument("--workers", type=int, default=DEFAULT_MAX_WORKERS, help="concurrent chunks per file")
+    parser.add_argument("--requests-per-second", type=float, default=DEFAULT_REQUESTS_PER_SECOND,
+                        help="recognizer request budget per job (0 = unlimited)")
+    parser.add_argument("--no-cache", action="store_true", help="do not read or write the transcript cache")
+    args = parser.parse_args(argv)
+
+    manager = JobManager(args.jobs, args.max_queued)
+    REGISTRY.register_gauge("jobs_queued", lambda: manager.queue_depth)
+    REGISTRY.register_gauge("jobs_running", lambda: manager.running)
+    service = TranscriptionService(manager, args.backend, None if args.no_cache else TranscriptCache(),
+                                   args.workers, args.requests_per_second)
+
+    server = create_server(service, args.host, args.port)
+    print(f"🚀 Transcription API on http://{args.host}:{args.port} "
+          f"({args.jobs} jobs, up to {args.max_queued or 'unlimited'} queued, backend {args.backend})")
+    print("⏹️  Press Ctrl+C to stop")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n👋 API stopped")
+    finally:
+        server.server_close()
+        manager.shutdown(wait=False)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,45 +1,34 @@
 import streamlit as st
 import os
-import tempfile
-import io
-from typing import Optional, List
 import time
-import threading
+from collections import Counter
+from importlib.util import find_spec
 from pathlib import Path
-import streamlit as st
 
-# Try to import required libraries with error handling
-try:
-    import speech_recognition as sr
-    from pydub import AudioSegment
-    from pydub.silence import split_on_silence
-except ImportError as e:
-    st.error(f"مكتبة مطلوبة غير مثبتة: {str(e)}")
+# Check required libraries without importing them; heavy modules load on first use
+missing_packages = [name for name in ("speech_recognition", "pydub", "numpy") if find_spec(name) is None]
+if missing_packages:
+    st.error(f"مكتبة مطلوبة غير مثبتة: {', '.join(missing_packages)}")
     st.info("يرجى تثبيت المكتبات المطلوبة باستخدام الأمر التالي:")
-    st.code("pip install SpeechRecognition pydub")
+    st.code("pip install SpeechRecognition pydub numpy")
     st.stop()
 
-try:
-    from moviepy.editor import VideoFileClip
-except ImportError:
+if find_spec("moviepy") is None:
     st.error("مكتبة moviepy غير مثبتة")
     st.info("يرجى تثبيت moviepy باستخدام الأمر التالي:")
     st.code("pip install moviepy")
     st.stop()
 
-# Configuration
-SUPPORTED_VIDEO_FORMATS = ['.mp4', '.avi', '.mov', '.mkv', '.webm', '.flv', '.m4v']
-SUPPORTED_LANGUAGES = {
-    'ar-SA': 'العربية',
-    'en-US': 'English',
-    'fr-FR': 'Français',
-    'de-DE': 'Deutsch',
-    'es-ES': 'Español',
-    'it-IT': 'Italiano',
-    'ja-JP': '日本語',
-    'ko-KR': '한국어',
-    'zh-CN': '中文'
-}
+from backends import BACKENDS, DEFAULT_BACKEND, BackendError, RecognizerBackend, get_backend
+from cache import TranscriptCache
+from jobs import Job, JobManager
+from metrics import DEFAULT_METRICS_PORT, REGISTRY, Metrics, start_metrics_server
+from transcriber import (DEFAULT_MAX_WORKERS, DEFAULT_REQUESTS_PER_SECOND, MAX_WORKERS_LIMIT,
+                         SUPPORTED_FORMATS, SUPPORTED_LANGUAGES, Transcript, transcribe_file,
+                         transcribe_video)
+from speech_filter import MUSIC, NOISE, SILENCE
+from stitching import stitch_segments
+from subtitles import create_srt_content, create_vtt_content, format_timestamp
 
 MAX_FILE_SIZE = 200 * 1024 * 1024  # 200MB
 
@@ -84,170 +73,228 @@ def setup_page():
     </style>
     """, unsafe_allow_html=True)
 
-def extract_audio_from_video(video_path: str, output_path: str) -> bool:
-    """Extract audio from video file"""
-    try:
-        with VideoFileClip(video_path) as video:
-            if video.audio is None:
-                st.error("❌ الفيديو لا يحتوي على مسار صوتي")
-                return False
-            
-            audio = video.audio
-            # Convert to wav format for better compatibility
-            audio.write_audiofile(output_path, verbose=False, logger=None)
-            
-        return True
-    except Exception as e:
-        st.error(f"❌ خطأ في استخراج الصوت: {str(e)}")
-        return False
+@st.cache_resource
+def get_transcript_cache() -> TranscriptCache:
+    """Open the on-disk transcript cache once per server process"""
+    return TranscriptCache()
 
-def split_audio_into_chunks(audio_path: str, chunk_length_ms: int = 30000) -> List[AudioSegment]:
-    """Split audio into smaller chunks for processing"""
-    try:
-        audio = AudioSegment.from_wav(audio_path)
-        
-        # Split on silence if possible, otherwise split by time
-        try:
-            chunks = split_on_silence(
-                audio,
-                min_silence_len=1000,  # 1 second
-                silence_thresh=audio.dBFS - 14,
-                keep_silence=500
-            )
-            
-            # If no silence found, split by time
-            if len(chunks) <= 1:
-                chunks = [audio[i:i+chunk_length_ms] for i in range(0, len(audio), chunk_length_ms)]
-                
-        except:
-            # Fallback to time-based splitting
-            chunks = [audio[i:i+chunk_length_ms] for i in range(0, len(audio), chunk_length_ms)]
-        
-        return chunks
-    except Exception as e:
-        st.error(f"❌ خطأ في تقسيم الصوت: {str(e)}")
-        return []
+@st.cache_resource
+def get_shared_backend(name: str) -> RecognizerBackend:
+    """Create each backend, with its recognizer and loaded models, once per server process"""
+    return get_backend(name)
 
-def transcribe_audio_chunk(audio_chunk: AudioSegment, language: str) -> str:
-    """Transcribe a single audio chunk"""
-    recognizer = sr.Recognizer()
-    
-    try:
-        # Convert AudioSegment to wav bytes
-        wav_bytes = io.BytesIO()
-        audio_chunk.export(wav_bytes, format="wav")
-        wav_bytes.seek(0)
-        
-        # Create AudioFile from bytes
-        with sr.AudioFile(wav_bytes) as source:
-            audio_data = recognizer.record(source)
-        
-        # Recognize speech
-        text = recognizer.recognize_google(audio_data, language=language)
-        return text
-        
-    except sr.UnknownValueError:
-        return ""  # No speech detected
-    except sr.RequestError as e:
-        st.warning(f"⚠️ خطأ في خدمة التعرف على الكلام: {str(e)}")
-        return ""
-    except Exception as e:
-        st.warning(f"⚠️ خطأ في معالجة الجزء: {str(e)}")
-        return ""
+@st.cache_resource
+def get_job_manager() -> JobManager:
+    """Share one background job pool between all sessions on this server"""
+    manager = JobManager()
+    REGISTRY.register_gauge("jobs_queued", lambda: manager.queue_depth)
+    REGISTRY.register_gauge("jobs_running", lambda: manager.running)
+    if DEFAULT_METRICS_PORT:
+        start_metrics_server(DEFAULT_METRICS_PORT)
+    return manager
+
+def run_transcription_job(video_file, language: str, chunk_duration: int, backend: RecognizerBackend,
+                          progress_callback=None, warning_callback=None, partial_callback=None,
+                          **options) -> dict:
+    """Job body: transcribe the video and keep what the results view needs
 
-def transcribe_video(video_file, language: str, chunk_duration: int, progress_callback=None) -> Optional[str]:
-    """Main transcription function"""
+    Segments are published through partial_callback as soon as they are
+    recognized so the page can show the transcript while the job runs.
+    """
+    with REGISTRY.track(Metrics()) as metrics:
+        transcript = transcribe_video(video_file, language, chunk_duration, progress_callback,
+                                      backend=backend, warning_callback=warning_callback,
+                                      segment_callback=partial_callback, metrics=metrics, **options)
+    return job_result(transcript, chunk_duration, metrics)
+
+def run_file_job(video_path: str, language: str, chunk_duration: int, backend: RecognizerBackend,
+                 progress_callback=None, warning_callback=None, partial_callback=None,
+                 **options) -> dict:
+    """Job body for a file already on the server, resumable after a restart"""
+    with REGISTRY.track(Metrics()) as metrics:
+        transcript = transcribe_file(video_path, language, chunk_duration, progress_callback,
+                                     backend=backend, warning_callback=warning_callback,
+                                     segment_callback=partial_callback, resumable=True, metrics=metrics,
+                                     **options)
+    return job_result(transcript, chunk_duration, metrics)
+
+def job_result(transcript: Transcript, chunk_duration: int, metrics: Metrics) -> dict:
+    """Keep what the results view needs"""
+    # Backends are shared between jobs, so latency comes from this job's own metrics
+    recognize = metrics.snapshot()["stages"].get("recognize")
+    return {
+        "transcript": transcript.text,
+        "segments": transcript.segments,
+        "failed": transcript.failed,
+        "skipped": transcript.skipped,
+        "chunk_duration": chunk_duration,
+        "average_latency": recognize["seconds"] / recognize["count"] if recognize else 0.0,
+        "metrics": metrics.snapshot()
+    }
+
+def render_job_result(job: Job):
+    """Show the transcript, downloads and statistics of a finished job"""
+    transcript = job.result["transcript"]
+    segments = job.result["segments"]
+    chunk_duration = job.result["chunk_duration"]
     
-    # Create temporary files
-    with tempfile.NamedTemporaryFile(delete=False, suffix='.wav') as temp_audio:
-        temp_audio_path = temp_audio.name
+    st.markdown("## 📄 النتيجة:")
     
-    with tempfile.NamedTemporaryFile(delete=False, suffix=os.path.splitext(video_file.name)[1]) as temp_video:
-        temp_video.write(video_file.read())
-        temp_video_path = temp_video.name
+    failed = job.result["failed"]
+    if failed:
+        ranges = "، ".join(f"{format_timestamp(segment.start, '.')}–{format_timestamp(segment.end, '.')}"
+                          for segment in failed)
+        st.warning(f"⚠️ تعذر التعرف على {len(failed)} جزء بعد إعادة المحاولة: {ranges}")
     
-    try:
-        # Extract audio from video
-        if progress_callback:
-            progress_callback(10, "🎵 استخراج الصوت من الفيديو...")
-        
-        if not extract_audio_from_video(temp_video_path, temp_audio_path):
-            return None
-        
-        # Split audio into chunks
-        if progress_callback:
-            progress_callback(20, "✂️ تقسيم الصوت إلى أجزاء...")
-        
-        chunk_length_ms = chunk_duration * 1000
-        audio_chunks = split_audio_into_chunks(temp_audio_path, chunk_length_ms)
-        
-        if not audio_chunks:
-            st.error("❌ فشل في تقسيم الصوت")
-            return None
-        
-        # Transcribe each chunk
-        transcript_parts = []
-        total_chunks = len(audio_chunks)
+    skipped = job.result["skipped"]
+    if skipped:
+        skipped_seconds = sum(skipped_range.end - skipped_range.start for skipped_range in skipped)
+        reasons = {SILENCE: "صمت", MUSIC: "موسيقى", NOISE: "ضوضاء"}
+        ranges = "، ".join(f"{format_timestamp(skipped_range.start, '.')}–{format_timestamp(skipped_range.end, '.')} "
+                          f"({reasons.get(skipped_range.reason, skipped_range.reason)})"
+                          for skipped_range in skipped)
+        st.info(f"🔇 تم تخطي {len(skipped)} جزء بدون كلام ({skipped_seconds:.0f}s): {ranges}")
+    
+    # Failed and skipped chunks above still explain a job that found no text
+    if not transcript:
+        st.error("❌ لم يتم العثور على نص في الفيديو أو حدث خطأ في المعالجة")
+        return
+    
+    # Chunks kept per language in a multi-language run
+    language_counts = Counter(segment.language for segment in segments if segment.text and segment.language)
+    if len(language_counts) > 1:
+        st.caption("🌍 " + "، ".join(f"{SUPPORTED_LANGUAGES.get(code, code)}: {count} جزء"
+                                     for code, count in language_counts.most_common()))
+    
+    # Display transcript
+    st.text_area(
+        "النص المستخرج:",
+        value=transcript,
+        height=300,
+        disabled=True,
+        key=f"transcript_{job.id}"
+    )
+    
+    # Download options
+    col_download1, col_download2, col_download3 = st.columns(3)
+    
+    with col_download1:
+        # Text file download
+        st.download_button(
+            label="💾 تحميل كملف نصي",
+            data=transcript,
+            file_name=f"{Path(job.name).stem}_transcript.txt",
+            mime="text/plain",
+            key=f"download_txt_{job.id}"
+        )
+    
+    with col_download2:
+        # SRT file download
+        st.download_button(
+            label="🎬 تحميل كملف ترجمة SRT",
+            data=create_srt_content(segments),
+            file_name=f"{Path(job.name).stem}_subtitles.srt",
+            mime="text/plain",
+            key=f"download_srt_{job.id}"
+        )
+    
+    with col_download3:
+        # WebVTT file download
+        st.download_button(
+            label="🌐 تحميل كملف ترجمة VTT",
+            data=create_vtt_content(segments),
+            file_name=f"{Path(job.name).stem}_subtitles.vtt",
+            mime="text/vtt",
+            key=f"download_vtt_{job.id}"
+        )
+    
+    # Statistics
+    word_count = len(transcript.split())
+    char_count = len(transcript)
+    
+    st.markdown("### 📊 إحصائيات:")
+    col_stat1, col_stat2, col_stat3, col_stat4 = st.columns(4)
+    with col_stat1:
+        st.metric("عدد الكلمات", word_count)
+    with col_stat2:
+        st.metric("عدد الأحرف", char_count)
+    with col_stat3:
+        st.metric("مدة المعالجة", f"{chunk_duration}s/جزء")
+    with col_stat4:
+        st.metric("زمن الاستجابة", f"{job.result['average_latency']:.2f}s/طلب")
+
+def render_job_metrics(job: Job):
+    """Per-stage timing breakdown of a finished job"""
+    metrics = job.result["metrics"]
+    
+    with st.expander("⏱️ تفاصيل الأداء"):
+        st.caption(f"المدة الكلية: {job.finished_at - job.started_at:.1f}s")
+        st.table([
+            {
+                "المرحلة": stage,
+                "المرات": entry["count"],
+                "المجموع (s)": round(entry["seconds"], 3),
+                "المتوسط (s)": round(entry["seconds"] / entry["count"], 3),
+                "الأقصى (s)": round(entry["max_seconds"], 3)
+            }
+            for stage, entry in metrics["stages"].items()
+        ])
+        st.json(metrics["counters"])
+
+def render_jobs() -> bool:
+    """List this session's jobs, returning True while any is still pending"""
+    manager = get_job_manager()
+    job_ids = st.session_state.get("job_ids", [])
+    jobs = [job for job in (manager.get(job_id) for job_id in job_ids) if job is not None]
+    st.session_state["job_ids"] = [job.id for job in jobs]
+    
+    for job in reversed(jobs):
+        st.markdown("---")
+        st.markdown(f"### 🎬 {job.name}")
         
-        for i, chunk in enumerate(audio_chunks):
-            if progress_callback:
-                progress = 30 + (60 * i // total_chunks)
-                progress_callback(progress, f"🔤 معالجة الجزء {i+1} من {total_chunks}...")
-            
-            text = transcribe_audio_chunk(chunk, language)
-            if text.strip():
-                transcript_parts.append(text.strip())
+        if job.status == Job.QUEUED:
+            st.info(f"⏳ في قائمة الانتظار ({manager.queue_depth} مهمة قبلها أو معها)")
+        elif job.status == Job.RUNNING:
+            st.progress(job.progress)
+            st.text(job.message or "⏳ جاري المعالجة...")
             
-            # Small delay to avoid hitting API limits
-            time.sleep(0.5)
-        
-        if progress_callback:
-            progress_callback(95, "📝 تجميع النص النهائي...")
-        
-        # Combine all text parts
-        full_transcript = " ".join(transcript_parts)
-        
-        if progress_callback:
-            progress_callback(100, "✅ تم الانتهاء!")
+            # Transcript so far, in chunk order
+            segments = stitch_segments(sorted(job.partial, key=lambda segment: segment.start))
+            live_text = " ".join(segment.text for segment in segments if segment.text)
+            if live_text:
+                st.text_area(
+                    f"live_{job.id}",
+                    value=live_text,
+                    height=200,
+                    disabled=True,
+                    label_visibility="collapsed"
+                )
+        elif job.status == Job.FAILED:
+            st.error(job.error)
+        else:
+            render_job_result(job)
+            render_job_metrics(job)
         
-        return full_transcript if full_transcript.strip() else None
+        for warning in job.warnings:
+            st.warning(warning)
         
-    except Exception as e:
-        st.error(f"❌ خطأ عام في المعالجة: {str(e)}")
-        return None
+        if job.finished and st.button("🗑️ إزالة", key=f"remove_{job.id}"):
+            manager.remove(job.id)
+            st.rerun()
     
-    finally:
-        # Clean up temporary files
-        try:
-            os.unlink(temp_audio_path)
-            os.unlink(temp_video_path)
-        except:
-            pass
+    return any(not job.finished for job in jobs)
 
-def create_srt_content(transcript: str, chunk_duration: int) -> str:
-    """Create SRT subtitle content from transcript"""
-    lines = transcript.split('. ')
-    srt_content = ""
-    
-    for i, line in enumerate(lines):
-        if line.strip():
-            start_time = i * chunk_duration
-            end_time = (i + 1) * chunk_duration
-            
-            start_hours = start_time // 3600
-            start_minutes = (start_time % 3600) // 60
-            start_seconds = start_time % 60
-            
-            end_hours = end_time // 3600
-            end_minutes = (end_time % 3600) // 60
-            end_seconds = end_time % 60
-            
-            srt_content += f"{i+1}\n"
-            srt_content += f"{start_hours:02d}:{start_minutes:02d}:{start_seconds:02d},000 --> "
-            srt_content += f"{end_hours:02d}:{end_minutes:02d}:{end_seconds:02d},000\n"
-            srt_content += f"{line.strip()}.\n\n"
+def start_job(name: str, fn, source, backend_name: str, **options):
+    """Create the backend and run fn on source in the background"""
+    try:
+        backend = get_shared_backend(backend_name)
+    except BackendError as e:
+        st.error(f"❌ تعذر تشغيل محرك التعرف على الكلام: {str(e)}")
+        return
     
-    return srt_content
+    # Run in the background so reruns and other users are not blocked
+    job_id = get_job_manager().submit(name, fn, source, backend=backend, **options)
+    st.session_state.setdefault("job_ids", []).append(job_id)
 
 def main():
     setup_page()
@@ -268,24 +315,99 @@ def main():
             index=0
         )
         
+        extra_languages = st.multiselect(
+            "🌍 لغات إضافية في نفس الفيديو:",
+            options=[code for code in SUPPORTED_LANGUAGES if code != selected_language],
+            format_func=lambda x: SUPPORTED_LANGUAGES[x],
+            help="يُستخرج الصوت ويُقسم مرة واحدة، ثم يُتعرف على كل جزء بكل اللغات ويُحتفظ بالنتيجة الأعلى ثقة"
+        )
+        
+        # Recognition backend
+        backend_names = list(BACKENDS.keys())
+        selected_backend = st.selectbox(
+            "🧠 محرك التعرف على الكلام:",
+            options=backend_names,
+            format_func=lambda x: BACKENDS[x].label,
+            index=backend_names.index(DEFAULT_BACKEND) if DEFAULT_BACKEND in backend_names else 0,
+            help="المحركات المحلية تعمل بدون إنترنت على المعالج"
+        )
+        
         # Chunk duration
         chunk_duration = st.slider(
             "⏱️ مدة كل جزء (ثانية):",
-            min_value=10,
+            min_value=5,
             max_value=60,
             value=30,
             step=5,
             help="مدة أطول = دقة أفضل لكن معالجة أبطأ"
         )
         
+        overlap = st.slider(
+            "↔️ تداخل الأجزاء (ثانية):",
+            min_value=0.0,
+            max_value=5.0,
+            value=0.0,
+            step=0.5,
+            help="يمتد كل جزء في بداية الجزء التالي حتى لا تضيع الكلمات عند الحدود، ثم تُدمج الكلمات المكررة. يسمح باستخدام أجزاء أقصر"
+        )
+        
+        streaming = st.checkbox(
+            "⚡ استخراج متدفق (ffmpeg)",
+            value=True,
+            help="يبدأ التعرف على الكلام أثناء استخراج الصوت مع استهلاك ثابت للذاكرة، ويقسم الصوت حسب الوقت بدلاً من فترات الصمت"
+        )
+        
+        speech_filter = st.checkbox(
+            "🔇 تخطي الأجزاء بدون كلام",
+            value=True,
+            help="لا تُرسل أجزاء الصمت أو الموسيقى أو الضوضاء لخدمة التعرف على الكلام"
+        )
+        
+        use_cache = st.checkbox(
+            "💾 استخدام النتائج المحفوظة",
+            value=True,
+            help="الأجزاء التي تم التعرف عليها سابقاً لا تُرسل مرة أخرى عند إعادة رفع نفس الملف"
+        )
+        
+        # Concurrency
+        max_workers = st.slider(
+            "🧵 عدد الأجزاء المتزامنة:",
+            min_value=1,
+            max_value=MAX_WORKERS_LIMIT,
+            value=DEFAULT_MAX_WORKERS,
+            help="عدد الأجزاء التي تُرسل لخدمة التعرف على الكلام في نفس الوقت"
+        )
+        
+        requests_per_second = st.number_input(
+            "🚦 الحد الأقصى للطلبات في الثانية:",
+            min_value=0.0,
+            max_value=20.0,
+            value=DEFAULT_REQUESTS_PER_SECOND,
+            step=0.5,
+            help="0 = بدون حد. قلل القيمة إذا ظهرت أخطاء من خدمة التعرف على الكلام"
+        )
+        
         st.markdown("---")
         st.markdown("### 📋 الصيغ المدعومة:")
         st.markdown("• MP4, AVI, MOV")
         st.markdown("• MKV, WebM, FLV")
         st.markdown("• M4V")
+        st.markdown("• صوت: MP3, M4A, WAV, OGG, FLAC")
         
         st.markdown("### 📏 الحد الأقصى:")
         st.markdown("• حجم الملف: 200MB")
+        st.markdown("• الملفات الأكبر: من مسار على الخادم")
+    
+    job_options = {
+        "language": [selected_language, *extra_languages] if extra_languages else selected_language,
+        "chunk_duration": chunk_duration,
+        "max_workers": max_workers,
+        "requests_per_second": requests_per_second,
+        "streaming": streaming,
+        "overlap": overlap,
+        "speech_filter": speech_filter,
+        "cache": get_transcript_cache() if use_cache else None
+    }
     
     # Main content
     col1, col2 = st.columns([2, 1])
@@ -293,96 +415,52 @@ def main():
     with col1:
         # File upload
         uploaded_file = st.file_uploader(
-            "📁 اختر ملف الفيديو:",
-            type=[fmt[1:] for fmt in SUPPORTED_VIDEO_FORMATS],
+            "📁 اختر ملف الفيديو أو الصوت:",
+            type=[fmt[1:] for fmt in SUPPORTED_FORMATS],
             help="اسحب وأسقط الملف هنا أو اضغط لاختيار الملف"
         )
         
         if uploaded_file is not None:
             # File validation
-            file_size = len(uploaded_file.getvalue())
+            file_size = uploaded_file.size
             file_extension = os.path.splitext(uploaded_file.name)[1].lower()
             
+            valid_file = False
+            
             if file_size > MAX_FILE_SIZE:
                 st.error(f"❌ حجم الملف كبير جداً: {file_size/1024/1024:.1f}MB (الحد الأقصى: 200MB)")
-                return
             
-            if file_extension not in SUPPORTED_VIDEO_FORMATS:
+            elif file_extension not in SUPPORTED_FORMATS:
                 st.error(f"❌ صيغة الملف غير مدعومة: {file_extension}")
-                return
             
-            # File info
-            st.success(f"✅ تم تحميل الملف: {uploaded_file.name}")
-            st.info(f"📊 حجم الملف: {file_size/1024/1024:.1f} MB")
+            else:
+                valid_file = True
+                
+                # File info
+                st.success(f"✅ تم تحميل الملف: {uploaded_file.name}")
+                st.info(f"📊 حجم الملف: {file_size/1024/1024:.1f} MB")
             
             # Processing button
-            if st.button("🚀 بدء استخراج النص", type="primary"):
-                # Progress tracking
-                progress_bar = st.progress(0)
-                status_text = st.empty()
-                
-                def update_progress(progress, message):
-                    progress_bar.progress(progress)
-                    status_text.text(message)
-                
-                # Start transcription
-                with st.spinner("⏳ جاري المعالجة..."):
-                    transcript = transcribe_video(
-                        uploaded_file, 
-                        selected_language, 
-                        chunk_duration,
-                        update_progress
-                    )
-                
-                if transcript:
-                    st.markdown("---")
-                    st.markdown("## 📄 النتيجة:")
-                    
-                    # Display transcript
-                    st.text_area(
-                        "النص المستخرج:",
-                        value=transcript,
-                        height=300,
-                        disabled=True
-                    )
-                    
-                    # Download options
-                    col_download1, col_download2 = st.columns(2)
-                    
-                    with col_download1:
-                        # Text file download
-                        st.download_button(
-                            label="💾 تحميل كملف نصي",
-                            data=transcript,
-                            file_name=f"{Path(uploaded_file.name).stem}_transcript.txt",
-                            mime="text/plain"
-                        )
-                    
-                    with col_download2:
-                        # SRT file download
-                        srt_content = create_srt_content(transcript, chunk_duration)
-                        st.download_button(
-                            label="🎬 تحميل كملف ترجمة SRT",
-                            data=srt_content,
-                            file_name=f"{Path(uploaded_file.name).stem}_subtitles.srt",
-                            mime="text/plain"
-                        )
-                    
-                    # Statistics
-                    word_count = len(transcript.split())
-                    char_count = len(transcript)
-                    
-                    st.markdown("### 📊 إحصائيات:")
-                    col_stat1, col_stat2, col_stat3 = st.columns(3)
-                    with col_stat1:
-                        st.metric("عدد الكلمات", word_count)
-                    with col_stat2:
-                        st.metric("عدد الأحرف", char_count)
-                    with col_stat3:
-                        st.metric("مدة المعالجة", f"{chunk_duration}s/جزء")
-                
+            if valid_file and st.button("🚀 بدء استخراج النص", type="primary"):
+                start_job(uploaded_file.name, run_transcription_job, uploaded_file, selected_backend, **job_options)
+        
+        # Files already on the server have no size limit and resume after a restart
+        with st.expander("📂 ملف كبير على الخادم"):
+            server_path = st.text_input(
+                "مسار الملف على الخادم:",
+                help="يُعالج الملف على أجزاء ثابتة مع حفظ التقدم، فيُستأنف من آخر جزء مكتمل بعد أي انقطاع"
+            )
+            
+            if server_path and st.button("🚀 معالجة الملف من الخادم"):
+                if not os.path.isfile(server_path):
+                    st.error(f"❌ الملف غير موجود: {server_path}")
+                elif os.path.splitext(server_path)[1].lower() not in SUPPORTED_FORMATS:
+                    st.error(f"❌ صيغة الملف غير مدعومة: {os.path.splitext(server_path)[1]}")
                 else:
-                    st.error("❌ لم يتم العثور على نص في الفيديو أو حدث خطأ في المعالجة")
+                    start_job(os.path.basename(server_path), run_file_job, server_path, selected_backend,
+                              **job_options)
+        
+        jobs_active = render_jobs()
     
     with col2:
         st.markdown("## 💡 نصائح للحصول على أفضل النتائج:")
@@ -427,6 +505,11 @@ pipwin install pyaudio
             • قلل مدة الأجزاء
             • تحقق من جودة الصوت
             """)
+    
+    # Poll running jobs by rerunning the script once the whole page is drawn
+    if jobs_active:
+        time.sleep(1)
+        st.rerun()
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,234 @@
+"""
+Video Transcription Tool - Speech Recognition Backends
+Each backend turns a chunk of raw PCM audio into text for a given language
+"""
+
+import hashlib
+import json
+import os
+import random
+import threading
+import time
+from typing import Dict, NamedTuple, Optional, Type
+
+DEFAULT_BACKEND = os.environ.get("TRANSCRIBE_BACKEND", "google")
+
+
+class AudioFormat(NamedTuple):
+    """PCM layout a backend wants its chunks in"""
+    sample_rate: int
+    sample_width: int
+    channels: int
+
+
+# 16 kHz 16-bit mono is what most speech engines consume natively
+DEFAULT_AUDIO_FORMAT = AudioFormat(16000, 2, 1)
+
+
+class Recognition(NamedTuple):
+    """Recognized text with the engine's confidence from 0 to 1 (0 when it reports none)"""
+    text: str
+    confidence: float = 0.0
+
+
+class NoSpeechError(Exception):
+    """Raised when a chunk contains no recognizable speech"""
+
+
+class BackendError(Exception):
+    """Raised when the recognition service or engine fails"""
+
+
+class ThrottledError(BackendError):
+    """Raised when the service rejects a request for exceeding its rate or quota"""
+
+
+class BackendUnavailableError(BackendError):
+    """Raised when a backend's dependencies or model are missing"""
+
+
+class RecognizerBackend:
+    """Base class for speech recognition backends"""
+
+    name = ""
+    label = ""
+    audio_format = DEFAULT_AUDIO_FORMAT
+
+    def __init__(self):
+        self.calls = 0
+        self.busy_seconds = 0.0
+        self._stats_lock = threading.Lock()
+
+    def recognize(self, audio_chunk, language: str) -> str:
+        """Return the text spoken in audio_chunk, a segmentation.PcmAudio
+
+        Backends implement either this or recognize_scored.
+        """
+        return self.recognize_scored(audio_chunk, language).text
+
+    def recognize_scored(self, audio_chunk, language: str) -> Recognition:
+        """Return the text spoken in audio_chunk with the engine's confidence"""
+        return Recognition(self.recognize(audio_chunk, language))
+
+    def transcribe(self, audio_chunk, language: str) -> str:
+        """Recognize a chunk while recording call count and latency"""
+        return self.transcribe_scored(audio_chunk, language).text
+
+    def transcribe_scored(self, audio_chunk, language: str) -> Recognition:
+        """Recognize a chunk with its confidence while recording call count and latency"""
+        started = time.perf_counter()
+        try:
+            return self.recognize_scored(audio_chunk, language)
+        finally:
+            elapsed = time.perf_counter() - started
+            with self._stats_lock:
+                self.calls += 1
+                self.busy_seconds += elapsed
+
+    @property
+    def average_latency(self) -> float:
+        """Mean seconds per recognize call"""
+        return self.busy_seconds / self.calls if self.calls else 0.0
+
+
+class GoogleBackend(RecognizerBackend):
+    """Free Google Web Speech API through SpeechRecognition"""
+
+    name = "google"
+    label = "Google (عبر الإنترنت)"
+
+    def __init__(self):
+        super().__init__()
+        try:
+            import speech_recognition as sr
+        except ImportError:
+            raise BackendUnavailableError("مكتبة SpeechRecognition غير مثبتة: pip install SpeechRecognition")
+        self._sr = sr
+        self._recognizer = sr.Recognizer()
+
+    def recognize_scored(self, audio_chunk, language: str) -> Recognition:
+        sr = self._sr
+
+        # Build AudioData straight from the PCM frames instead of a WAV round trip
+        mono = audio_chunk.mono()
+        audio_data = sr.AudioData(mono.raw_data.tobytes(), mono.frame_rate, mono.sample_width)
+
+        try:
+            # The raw response carries the confidence the plain result drops
+            response = self._recognizer.recognize_google(audio_data, language=language, show_all=True)
+        except sr.UnknownValueError:
+            raise NoSpeechError()
+        except sr.RequestError as e:
+            if any(marker in str(e).lower() for marker in ("429", "too many requests", "quota")):
+                raise ThrottledError(str(e))
+            raise BackendError(str(e))
+
+        alternatives = response.get("alternative") if isinstance(response, dict) else None
+        if not alternatives:
+            raise NoSpeechError()
+        best = max(alternatives, key=lambda alternative: alternative.get("confidence", 0.0))
+        return Recognition(best["transcript"], best.get("confidence", 0.0))
+
+
+class VoskBackend(RecognizerBackend):
+    """Offline CPU recognition with Vosk models
+
+    Models are looked up in VOSK_MODEL_DIR as one directory per language
+    code (e.g. ``ar-SA``) or language prefix (e.g. ``en``).
+    """
+
+    name = "vosk"
+    label = "Vosk (بدون إنترنت)"
+
+    def __init__(self, model_dir: Optional[str] = None):
+        super().__init__()
+        try:
+            import vosk
+        except ImportError:
+            raise BackendUnavailableError("مكتبة vosk غير مثبتة: pip install vosk")
+
+        vosk.SetLogLevel(-1)
+        self._vosk = vosk
+        self.model_dir = model_dir or os.environ.get("VOSK_MODEL_DIR", "models")
+        self._models: Dict[str, object] = {}
+        self._models_lock = threading.Lock()
+
+    def _get_model(self, language: str):
+        with self._models_lock:
+            if language not in self._models:
+                for candidate in (language, language.split("-")[0]):
+                    path = os.path.join(self.model_dir, candidate)
+                    if os.path.isdir(path):
+                        self._models[language] = self._vosk.Model(path)
+                        break
+                else:
+                    raise BackendUnavailableError(f"لا يوجد نموذج Vosk للغة {language} في {self.model_dir}")
+            return self._models[language]
+
+    def recognize_scored(self, audio_chunk, language: str) -> Recognition:
+        model = self._get_model(language)
+        audio = audio_chunk.convert(*self.audio_format)
+
+        recognizer = self._vosk.KaldiRecognizer(model, audio.frame_rate)
+        recognizer.SetWords(True)
+        recognizer.AcceptWaveform(audio.raw_data.tobytes())
+        result = json.loads(recognizer.FinalResult())
+        text = result.get("text", "")
+
+        if not text.strip():
+            raise NoSpeechError()
+        # Mean of the per-word confidences
+        words = result.get("result", [])
+        confidence = sum(word.get("conf", 0.0) for word in words) / len(words) if words else 0.0
+        return Recognition(text, confidence)
+
+
+class FakeBackend(RecognizerBackend):
+    """Deterministic offline backend for tests and benchmarks
+
+    The returned text and confidence depend only on the chunk's audio and
+    language. An optional fixed latency simulates a network round trip and an optional
+    error rate simulates a throttled service.
+    """
+
+    name = "fake"
+    label = "Fake (للاختبار)"
+
+    def __init__(self, latency: Optional[float] = None, error_rate: Optional[float] = None):
+        super().__init__()
+        if latency is None:
+            latency = float(os.environ.get("FAKE_BACKEND_LATENCY", "0"))
+        if error_rate is None:
+            error_rate = float(os.environ.get("FAKE_BACKEND_ERROR_RATE", "0"))
+        self.latency = latency
+        self.error_rate = error_rate
+
+    def recognize_scored(self, audio_chunk, language: str) -> Recognition:
+        if self.latency:
+            time.sleep(self.latency)
+
+        if self.error_rate and random.random() < self.error_rate:
+            raise ThrottledError("simulated rate limit")
+
+        if audio_chunk.rms == 0:
+            raise NoSpeechError()
+
+        digest = hashlib.sha1(audio_chunk.raw_data).hexdigest()[:8]
+        confidence = int(hashlib.sha1(f"{digest}:{language}".encode()).hexdigest()[:4], 16) / 0xFFFF
+        return Recognition(f"[{language}] {len(audio_chunk)}ms {digest}", round(confidence, 3))
+
+
+BACKENDS: Dict[str, Type[RecognizerBackend]] = {
+    GoogleBackend.name: GoogleBackend,
+    VoskBackend.name: VoskBackend,
+    FakeBackend.name: FakeBackend,
+}
+
+
+def get_backend(name: str = DEFAULT_BACKEND, **options) -> RecognizerBackend:
+    """Create the backend registered under name"""
+    try:
+        backend_class = BACKENDS[name]
+    except KeyError:
+        raise BackendUnavailableError(f"محرك التعرف غير معروف: {name}")
+    return backend_class(**options)
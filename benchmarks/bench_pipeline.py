@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+"""
+Video Transcription Tool - Pipeline Benchmark
+Times each pipeline stage on synthetic fixtures with the fake recognizer
+
+Every stage runs in a fresh process so its peak RSS is its own. Results can
+be saved as JSON and compared against an earlier run:
+
+    python benchmarks/bench_pipeline.py --seconds 600 -o before.json
+    python benchmarks/bench_pipeline.py --seconds 600 --compare before.json
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import wave
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backends import get_backend
+from bench_silence import make_speech_like_audio
+from subtitles import create_srt_content
+from transcriber import (extract_audio_from_video, get_ffmpeg_executable, split_audio_into_chunks,
+                         stream_audio_chunks, transcribe_chunks, transcribe_file)
+
+STAGES = ("extract", "split", "stream", "transcribe", "srt", "end_to_end", "end_to_end_filtered",
+          "end_to_end_wav", "end_to_end_audio", "end_to_end_audio_wav")
+
+
+def make_tone_audio(seconds: float, frame_rate: int = 16000) -> np.ndarray:
+    """A steady 440 Hz tone: no silence, so every chunk carries sound"""
+    t = np.arange(int(seconds * frame_rate)) / frame_rate
+    return 0.3 * np.sin(2 * np.pi * 440 * t)
+
+
+def write_fixtures(directory: str, seconds: float, frame_rate: int, kind: str):
+    """Write the synthetic WAV and a video muxing it with a tiny blank picture"""
+    if kind == "tone":
+        data = (make_tone_audio(seconds, frame_rate) * 32767).astype("<i2").tobytes()
+    else:
+        data = make_speech_like_audio(seconds, frame_rate).raw_data
+
+    audio_path = os.path.join(directory, "fixture.wav")
+    with wave.open(audio_path, "wb") as f:
+        f.setnchannels(1)
+        f.setsampwidth(2)
+        f.setframerate(frame_rate)
+        f.writeframes(data)
+
+    video_path = os.path.join(directory, "fixture.mp4")
+    subprocess.run([
+        get_ffmpeg_executable(), "-nostdin", "-v", "error", "-y",
+        "-f", "lavfi", "-i", f"color=c=black:s=64x64:r=1:d={seconds}",
+        "-i", audio_path, "-shortest", "-c:v", "mpeg4", "-c:a", "aac", video_path
+    ], check=True)
+    return audio_path, video_path
+
+
+def run_stage(stage: str, audio_path: str, video_path: str, chunk_duration: int, workers: int):
+    """Child process body: run one stage and return its wall time, CPU time, peak RSS and RSS growth
+
+    The *_audio stages feed the fixture WAV itself, as for podcast input,
+    instead of the video muxing it. End-to-end stages run without the speech
+    filter, which would skip the synthetic fixtures as music; the *_filtered
+    stage times the filter itself.
+    """
+    backend = get_backend("fake")
+    chunk_length_ms = chunk_duration * 1000
+    # Inputs a stage needs but should not be timed for
+    chunks = split_audio_into_chunks(audio_path, chunk_length_ms) if stage in ("transcribe", "srt") else None
+    segments = transcribe_chunks(chunks, "en-US", backend, workers) if stage == "srt" else None
+
+    rss_before = peak_rss_mb()
+    cpu_before = cpu_seconds()
+    started = time.perf_counter()
+    if stage == "extract":
+        with tempfile.TemporaryDirectory() as directory:
+            extract_audio_from_video(video_path, os.path.join(directory, "audio.wav"))
+    elif stage == "split":
+        chunks = split_audio_into_chunks(audio_path, chunk_length_ms)
+        for chunk in chunks:
+            chunk.raw_data
+    elif stage == "stream":
+        for chunk in stream_audio_chunks(video_path, chunk_length_ms):
+            pass
+    elif stage == "transcribe":
+        transcribe_chunks(chunks, "en-US", backend, workers)
+    elif stage == "srt":
+        create_srt_content(segments)
+    elif stage == "end_to_end":
+        transcribe_file(video_path, "en-US", chunk_duration, backend=backend, max_workers=workers,
+                        requests_per_second=0, streaming=True, speech_filter=False)
+    elif stage == "end_to_end_filtered":
+        transcribe_file(video_path, "en-US", chunk_duration, backend=backend, max_workers=workers,
+                        requests_per_second=0, streaming=True, speech_filter=True)
+    elif stage == "end_to_end_wav":
+        transcribe_file(video_path, "en-US", chunk_duration, backend=backend, max_workers=workers,
+                        requests_per_second=0, streaming=False, speech_filter=False)
+    elif stage == "end_to_end_audio":
+        transcribe_file(audio_path, "en-US", chunk_duration, backend=backend, max_workers=workers,
+                        requests_per_second=0, streaming=True, speech_filter=False)
+    elif stage == "end_to_end_audio_wav":
+        transcribe_file(audio_path, "en-US", chunk_duration, backend=backend, max_workers=workers,
+                        requests_per_second=0, streaming=False, speech_filter=False)
+    elapsed = time.perf_counter() - started
+    cpu = cpu_seconds() - cpu_before
+
+    rss = peak_rss_mb()
+    return elapsed, cpu, rss, rss - rss_before
+
+
+def cpu_seconds() -> float:
+    """User and system CPU time of this process and its finished children (ffmpeg)"""
+    import resource
+    return sum(usage.ru_utime + usage.ru_stime
+               for usage in (resource.getrusage(resource.RUSAGE_SELF),
+                             resource.getrusage(resource.RUSAGE_CHILDREN)))
+
+
+def peak_rss_mb() -> float:
+    import resource
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except OSError:
+        return ""
+
+
+def compare(results: list, baseline_path: str):
+    with open(baseline_path, encoding="utf-8") as f:
+        baseline = {result["stage"]: result for result in json.load(f)["results"]}
+
+    print(f"📊 compared with {baseline_path}")
+    for result in results:
+        before = baseline.get(result["stage"])
+        if not before:
+            continue
+        ratio = before["wall_seconds"] / result["wall_seconds"] if result["wall_seconds"] else 0
+        print(f"   {result['stage']:<20} {before['wall_seconds']:8.3f}s -> {result['wall_seconds']:8.3f}s"
+              f"  ({ratio:.2f}x)  RSS {before['peak_rss_mb']:.0f} -> {result['peak_rss_mb']:.0f} MB")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--seconds", type=float, default=300, help="length of the synthetic recording")
+    parser.add_argument("--frame-rate", type=int, default=16000)
+    parser.add_argument("--kind", choices=("speech", "tone"), default="speech",
+                        help="speech-like bursts with silence gaps, or a steady tone")
+    parser.add_argument("--chunk-duration", type=int, default=30)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--stages", default=",".join(STAGES), help="comma separated subset of: " + ", ".join(STAGES))
+    parser.add_argument("-o", "--output", help="write results to this JSON file")
+    parser.add_argument("--compare", help="JSON file from an earlier run to compare against")
+    args = parser.parse_args()
+
+    stages = [stage.strip() for stage in args.stages.split(",") if stage.strip()]
+    unknown = set(stages) - set(STAGES)
+    if unknown:
+        parser.error(f"unknown stages: {', '.join(sorted(unknown))}")
+
+    results = []
+    context = multiprocessing.get_context("spawn")
+
+    with tempfile.TemporaryDirectory() as directory:
+        print(f"🎵 {args.seconds:.0f}s of {args.kind} audio at {args.frame_rate} Hz")
+        # Built in a child too, since a spawned process starts from its parent's peak RSS
+        with context.Pool(1) as pool:
+            audio_path, video_path = pool.apply(write_fixtures, (directory, args.seconds, args.frame_rate, args.kind))
+
+        for stage in stages:
+            with context.Pool(1) as pool:
+                elapsed, cpu, rss, growth = pool.apply(run_stage, (stage, audio_path, video_path,
+                                                           args.chunk_duration, args.workers))
+            throughput = args.seconds / elapsed if elapsed else float("inf")
+            results.append({
+                "stage": stage,
+                "wall_seconds": round(elapsed, 4),
+                "cpu_seconds": round(cpu, 4),
+                "audio_seconds_per_second": round(throughput, 1),
+                "peak_rss_mb": round(rss, 1),
+                "rss_growth_mb": round(growth, 1),
+            })
+            print(f"⏱️ {stage:<20} {elapsed:8.3f}s  {cpu:8.3f}s CPU  {throughput:10.1f} audio-s/s  "
+                  f"{rss:7.1f} MB peak (+{growth:.1f} MB in stage)")
+
+    if args.compare:
+        compare(results, args.compare)
+
+    if args.output:
+        report = {
+            "commit": git_commit(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "settings": {key: value for key, value in vars(args).items() if key not in ("output", "compare")},
+            "results": results,
+        }
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"💾 saved {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Video Transcription Tool - Silence Splitting Benchmark
+Compares pydub's split_on_silence with the NumPy segmenter on synthetic audio
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+from pydub import AudioSegment
+from pydub.silence import split_on_silence
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from segmentation import split_on_silence_ranges
+
+
+def make_speech_like_audio(seconds: float, frame_rate: int = 16000, seed: int = 0) -> AudioSegment:
+    """Alternate noisy tone bursts with quiet gaps to mimic speech and pauses"""
+    rng = np.random.default_rng(seed)
+    total = int(seconds * frame_rate)
+    parts = []
+    length = 0
+
+    while length < total:
+        speech = int(rng.uniform(1.0, 6.0) * frame_rate)
+        gap = int(rng.uniform(0.3, 2.5) * frame_rate)
+        t = np.arange(speech) / frame_rate
+        burst = 0.4 * np.sin(2 * np.pi * rng.uniform(120, 300) * t) * (1 + 0.5 * rng.standard_normal(speech))
+        parts.append(burst)
+        parts.append(0.002 * rng.standard_normal(gap))
+        length += speech + gap
+
+    samples = np.clip(np.concatenate(parts)[:total], -1, 1)
+    data = (samples * 32767).astype("<i2").tobytes()
+    return AudioSegment(data=data, sample_width=2, frame_rate=frame_rate, channels=1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--seconds", type=float, default=300, help="length of the synthetic audio")
+    parser.add_argument("--frame-rate", type=int, default=16000)
+    parser.add_argument("--skip-pydub", action="store_true", help="only time the NumPy segmenter")
+    args = parser.parse_args()
+
+    audio = make_speech_like_audio(args.seconds, args.frame_rate)
+    settings = dict(min_silence_len=1000, silence_thresh=audio.dBFS - 14, keep_silence=500)
+    print(f"🎵 {args.seconds:.0f}s of audio at {args.frame_rate} Hz")
+
+    started = time.perf_counter()
+    ranges = split_on_silence_ranges(audio, **settings)
+    numpy_seconds = time.perf_counter() - started
+    print(f"⚡ numpy: {numpy_seconds:.3f}s, {len(ranges)} chunks")
+
+    if args.skip_pydub:
+        return
+
+    started = time.perf_counter()
+    chunks = split_on_silence(audio, **settings)
+    pydub_seconds = time.perf_counter() - started
+    print(f"🐢 pydub: {pydub_seconds:.3f}s, {len(chunks)} chunks")
+
+    same = [len(chunk) for chunk in chunks] == [len(audio.get_sample_slice(start, end)) for start, end in ranges]
+    print(f"{'✅' if same else '❌'} chunk boundaries {'match' if same else 'differ'}")
+    print(f"🚀 speedup: {pydub_seconds / numpy_seconds:.0f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Video Transcription Tool - Startup Benchmark
+Measures cold import time of the app and the cost of a Streamlit rerun
+
+Each sample runs in a fresh interpreter. Pass --ref to measure an older
+commit side by side, e.g. before lazy imports:
+
+    python benchmarks/bench_startup.py --ref HEAD~1
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Runs in the child: time importing streamlit, then the app, then two script runs
+PROBE = r"""
+import json, logging, sys, time
+logging.disable(logging.WARNING)
+sys.path.insert(0, sys.argv[1])
+started = time.perf_counter()
+import streamlit
+streamlit_done = time.perf_counter()
+import app
+app_done = time.perf_counter()
+heavy = [name for name in ("moviepy", "pydub", "speech_recognition") if name in sys.modules]
+
+from streamlit.testing.v1 import AppTest
+test = AppTest.from_file(sys.argv[1] + "/app.py", default_timeout=60)
+run_started = time.perf_counter()
+test.run()
+first_run = time.perf_counter() - run_started
+run_started = time.perf_counter()
+test.run()
+rerun = time.perf_counter() - run_started
+
+print(json.dumps({
+    "import_streamlit": streamlit_done - started,
+    "import_app": app_done - streamlit_done,
+    "first_run": first_run,
+    "rerun": rerun,
+    "heavy_modules": heavy,
+}))
+"""
+
+
+def measure(source_dir: str, repeats: int) -> dict:
+    samples = []
+    for _ in range(repeats):
+        result = subprocess.run([sys.executable, "-c", PROBE, source_dir], capture_output=True, text=True,
+                                cwd=source_dir)
+        if result.returncode != 0:
+            raise RuntimeError(result.stderr.strip().splitlines()[-1])
+        samples.append(json.loads(result.stdout.strip().splitlines()[-1]))
+
+    summary = {key: statistics.median(sample[key] for sample in samples)
+               for key in ("import_streamlit", "import_app", "first_run", "rerun")}
+    summary["heavy_modules"] = samples[-1]["heavy_modules"]
+    return summary
+
+
+def export_ref(ref: str, directory: str):
+    """Write the tree of a git ref into directory"""
+    archive = subprocess.run(["git", "archive", ref], cwd=ROOT, capture_output=True, check=True).stdout
+    subprocess.run(["tar", "-x", "-C", directory], input=archive, check=True)
+
+
+def report(label: str, summary: dict):
+    print(f"📦 {label}")
+    print(f"   import streamlit {summary['import_streamlit'] * 1000:8.1f} ms")
+    print(f"   import app       {summary['import_app'] * 1000:8.1f} ms")
+    print(f"   first run        {summary['first_run'] * 1000:8.1f} ms")
+    print(f"   rerun            {summary['rerun'] * 1000:8.1f} ms")
+    print(f"   heavy modules loaded at startup: {', '.join(summary['heavy_modules']) or 'none'}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeats", type=int, default=5, help="fresh interpreters per measurement (median)")
+    parser.add_argument("--ref", help="also measure this git ref for comparison")
+    parser.add_argument("-o", "--output", help="write results to this JSON file")
+    args = parser.parse_args()
+
+    results = {"working tree": measure(ROOT, args.repeats)}
+    if args.ref:
+        with tempfile.TemporaryDirectory() as directory:
+            export_ref(args.ref, directory)
+            results[args.ref] = measure(directory, args.repeats)
+
+    for label, summary in results.items():
+        report(label, summary)
+
+    if args.ref:
+        before, after = results[args.ref], results["working tree"]
+        print(f"🚀 app import {before['import_app'] / after['import_app']:.1f}x, "
+              f"first run {before['first_run'] / after['first_run']:.1f}x faster than {args.ref}")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(f"💾 saved {args.output}")
+
+
+if __name__ == "__main__":
+    main()
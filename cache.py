@@ -0,0 +1,123 @@
+"""
+Video Transcription Tool - Transcript Cache
+Persists recognized text per audio chunk so re-uploads and reruns skip recognition
+"""
+
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from typing import Optional
+
+from backends import Recognition
+
+DEFAULT_CACHE_DIR = os.environ.get(
+    "TRANSCRIBE_CACHE_DIR",
+    os.path.join(os.path.expanduser("~"), ".cache", "video-transcription")
+)
+DEFAULT_CACHE_MAX_BYTES = int(os.environ.get("TRANSCRIBE_CACHE_MAX_BYTES", 64 * 1024 * 1024))
+
+
+class TranscriptCache:
+    """SQLite-backed chunk transcript store with size-based LRU eviction
+
+    Entries are keyed by a hash of the chunk's decoded PCM audio and format
+    plus the language and backend, so any change to extraction or chunking
+    settings naturally produces new keys.
+    """
+
+    def __init__(self, cache_dir: str = DEFAULT_CACHE_DIR, max_bytes: int = DEFAULT_CACHE_MAX_BYTES):
+        os.makedirs(cache_dir, exist_ok=True)
+        self.path = os.path.join(cache_dir, "transcripts.sqlite3")
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS chunks ("
+                " key TEXT PRIMARY KEY,"
+                " text TEXT NOT NULL,"
+                " size INTEGER NOT NULL,"
+                " last_access REAL NOT NULL,"
+                " confidence REAL NOT NULL DEFAULT 0)"
+            )
+            # Caches written before confidences were kept
+            columns = {row[1] for row in self._conn.execute("PRAGMA table_info(chunks)")}
+            if "confidence" not in columns:
+                self._conn.execute("ALTER TABLE chunks ADD COLUMN confidence REAL NOT NULL DEFAULT 0")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS chunks_last_access ON chunks (last_access)")
+            # Running size of the stored entries, so a put only scans the table when over budget
+            self._total = self._stored_size()
+
+    @staticmethod
+    def make_key(audio_data: bytes, frame_rate: int, sample_width: int, channels: int,
+                 language: str, backend: str) -> str:
+        """Build the cache key for one chunk of raw PCM audio"""
+        digest = hashlib.sha256()
+        digest.update(f"{frame_rate}:{sample_width}:{channels}:{language}:{backend}\0".encode())
+        digest.update(audio_data)
+        return digest.hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached text for key, or None on a miss"""
+        recognition = self.get_recognition(key)
+        return recognition.text if recognition else None
+
+    def get_recognition(self, key: str) -> Optional[Recognition]:
+        """Return the cached text and confidence for key, or None on a miss"""
+        with self._lock, self._conn:
+            row = self._conn.execute("SELECT text, confidence FROM chunks WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+
+            self.hits += 1
+            self._conn.execute("UPDATE chunks SET last_access = ? WHERE key = ?", (time.time(), key))
+            return Recognition(*row)
+
+    def put(self, key: str, text: str, confidence: float = 0.0):
+        """Store text for key, evicting least recently used entries when over budget"""
+        size = len(key) + len(text.encode("utf-8"))
+        with self._lock, self._conn:
+            replaced = self._conn.execute("SELECT size FROM chunks WHERE key = ?", (key,)).fetchone()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO chunks (key, text, size, last_access, confidence) VALUES (?, ?, ?, ?, ?)",
+                (key, text, size, time.time(), confidence)
+            )
+            self._total += size - (replaced[0] if replaced else 0)
+            if self._total > self.max_bytes:
+                self._evict()
+
+    def _stored_size(self) -> int:
+        return self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM chunks").fetchone()[0]
+
+    def _evict(self):
+        # Other processes may share the file, so re-count before deleting anything
+        self._total = self._stored_size()
+        if self._total <= self.max_bytes:
+            return
+
+        excess = self._total - self.max_bytes
+        stale_keys = []
+        for key, size in self._conn.execute("SELECT key, size FROM chunks ORDER BY last_access"):
+            stale_keys.append((key,))
+            excess -= size
+            if excess <= 0:
+                break
+        self._conn.executemany("DELETE FROM chunks WHERE key = ?", stale_keys)
+        self._total = self.max_bytes + excess
+
+    def clear(self):
+        """Remove every cached entry"""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM chunks")
+            self._total = 0
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
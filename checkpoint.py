@@ -0,0 +1,131 @@
+"""
+Video Transcription Tool - Checkpoints
+Records finished chunks of a long transcription so an interrupted run can resume
+"""
+
+import hashlib
+import json
+import os
+from typing import Dict
+
+from subtitles import Segment
+
+DEFAULT_CHECKPOINT_DIR = os.environ.get(
+    "TRANSCRIBE_CHECKPOINT_DIR",
+    os.path.join(os.path.expanduser("~"), ".cache", "video-transcription", "checkpoints")
+)
+
+
+class Checkpoint:
+    """Append-only JSON lines log of the fixed-length chunks already transcribed
+
+    The first line describes the run (source file size and mtime, language,
+    backend, chunk length and overlap); a log written for different settings or a
+    modified file is discarded. Every later line is one finished chunk, with
+    the reason it was skipped as non-speech if it was, so a crash loses at
+    most the line being written.
+    """
+
+    def __init__(self, path: str, header: dict):
+        self.path = path
+        self.header = header
+        self.done: Dict[int, Segment] = {}
+        self.skipped: Dict[int, str] = {}
+        self._load()
+
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._file = open(path, "a", encoding="utf-8")
+        if self._file.tell() == 0:
+            self._write(header)
+
+    @classmethod
+    def for_run(cls, video_path: str, language: str, backend: str, chunk_duration: int,
+                overlap: float = 0.0, checkpoint_dir: str = DEFAULT_CHECKPOINT_DIR) -> "Checkpoint":
+        """Open the checkpoint for transcribing video_path with these settings"""
+        stat = os.stat(video_path)
+        header = {
+            "file": os.path.abspath(video_path),
+            "size": stat.st_size,
+            "mtime": stat.st_mtime,
+            "language": language,
+            "backend": backend,
+            "chunk_duration": chunk_duration,
+            "overlap": overlap,
+        }
+        name = hashlib.sha256(json.dumps(header, sort_keys=True).encode()).hexdigest()[:32]
+        return cls(os.path.join(checkpoint_dir, f"{name}.jsonl"), header)
+
+    def _load(self):
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                content = f.read()
+        except FileNotFoundError:
+            return
+
+        lines = content.splitlines()
+        try:
+            header = json.loads(lines[0]) if lines else None
+        except ValueError:
+            header = None
+        if header != self.header:
+            os.unlink(self.path)
+            return
+
+        for line in lines[1:]:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                # Torn write from a crash; that chunk is simply redone
+                continue
+            self.done[record["index"]] = Segment(record["start"], record["end"], record["text"],
+                                            record.get("language", ""))
+            if record.get("skipped"):
+                self.skipped[record["index"]] = record["skipped"]
+
+        if not content.endswith("\n"):
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write("\n")
+
+    def _write(self, record: dict):
+        self._file.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    @property
+    def resume_index(self) -> int:
+        """Index of the first chunk not yet transcribed"""
+        index = 0
+        while index in self.done:
+            index += 1
+        return index
+
+    def index_of(self, seconds: float) -> int:
+        """Index of the fixed-length chunk starting at seconds"""
+        return round(seconds / self.header["chunk_duration"])
+
+    def add(self, segment: Segment, skip_reason: str = ""):
+        """Record a finished chunk, and why it was skipped if the speech filter rejected it"""
+        index = self.index_of(segment.start)
+        if index in self.done:
+            return
+        self.done[index] = segment
+        record = {"index": index, **segment._asdict()}
+        if skip_reason:
+            self.skipped[index] = skip_reason
+            record["skipped"] = skip_reason
+        self._write(record)
+
+    def close(self, remove: bool = False):
+        """Close the log, deleting it when the run completed"""
+        self._file.close()
+        if remove:
+            try:
+                os.unlink(self.path)
+            except OSError:
+                pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
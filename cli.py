@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""
+Video Transcription Tool - Batch Command Line Interface
+Transcribes many videos in parallel without the Streamlit UI
+
+Examples:
+    python cli.py videos/ -o transcripts/ --language ar-SA
+    python cli.py "archive/**/*.mp4" -o out/ --jobs 8 --formats txt,srt,json
+    python cli.py recordings/lecture-6h.mkv --resume
+    python cli.py interviews/ -l ar-SA -l en-US
+"""
+
+import argparse
+import glob
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+from backends import BACKENDS, DEFAULT_BACKEND, get_backend
+from cache import TranscriptCache
+from metrics import Metrics, MetricsRegistry
+from pipeline import DEFAULT_QUEUE_SIZE
+from transcriber import (DEFAULT_MAX_WORKERS, DEFAULT_REQUESTS_PER_SECOND, SUPPORTED_FORMATS,
+                         SUPPORTED_LANGUAGES, create_json_content, transcribe_file)
+from subtitles import create_srt_content, create_vtt_content
+
+OUTPUT_FORMATS = ("txt", "srt", "vtt", "json")
+
+# Per-process transcript cache, opened on first use in each worker
+_cache: Optional[TranscriptCache] = None
+
+
+def glob_root(pattern: str) -> Path:
+    """Leading directories of a glob pattern, up to the first one with wildcards"""
+    literal = []
+    for part in Path(pattern).parts[:-1]:
+        if glob.has_magic(part):
+            break
+        literal.append(part)
+    return Path(*literal)
+
+
+def find_videos(inputs: List[str]) -> List[Tuple[Path, Path]]:
+    """Expand files, directories and glob patterns into (video, relative output stem) pairs
+
+    Stems keep each file's path below the directory or the glob pattern's
+    fixed prefix, so same-named files in different folders do not share
+    outputs. Raises ValueError when two videos would still write the same
+    outputs, e.g. talk.mp4 and talk.mp3 side by side.
+    """
+    found = {}
+
+    for item in inputs:
+        if os.path.isdir(item):
+            root = Path(item)
+            for path in sorted(root.rglob("*")):
+                if path.suffix.lower() in SUPPORTED_FORMATS and path.is_file():
+                    found.setdefault(path.resolve(), path.relative_to(root).with_suffix(""))
+        else:
+            matches = glob.glob(item, recursive=True) if glob.has_magic(item) else [item]
+            root = glob_root(item)
+            for match in sorted(matches):
+                path = Path(match)
+                if path.suffix.lower() in SUPPORTED_FORMATS and path.is_file():
+                    found.setdefault(path.resolve(), path.relative_to(root).with_suffix(""))
+
+    videos_by_stem = {}
+    for video, stem in found.items():
+        videos_by_stem.setdefault(stem, []).append(video)
+    clashes = [f"{', '.join(str(video) for video in videos)} -> {stem}"
+               for stem, videos in videos_by_stem.items() if len(videos) > 1]
+    if clashes:
+        raise ValueError("videos would write the same outputs: " + "; ".join(clashes))
+
+    return list(found.items())
+
+
+def output_paths(output_dir: Path, stem: Path, formats: List[str]) -> List[Path]:
+    return [output_dir / stem.with_name(f"{stem.name}.{fmt}") for fmt in formats]
+
+
+def process_file(video_path: Path, stem: Path, output_dir: Path, formats: List[str],
+                 options: dict) -> Tuple[bool, str, dict]:
+    """Worker entry point: transcribe one video, write its outputs and return its metrics snapshot"""
+    global _cache
+    if options.pop("use_cache") and _cache is None:
+        _cache = TranscriptCache()
+
+    warnings = []
+    metrics = Metrics()
+    started = time.perf_counter()
+    try:
+        backend = get_backend(options.pop("backend"))
+        transcript = transcribe_file(str(video_path), backend=backend, cache=_cache,
+                                     warning_callback=warnings.append, metrics=metrics, **options)
+    except Exception as e:
+        return False, str(e), metrics.snapshot()
+    elapsed = time.perf_counter() - started
+
+    text, segments, failed, skipped = transcript
+    contents = {
+        "txt": lambda: text,
+        "srt": lambda: create_srt_content(segments),
+        "vtt": lambda: create_vtt_content(segments),
+        "json": lambda: create_json_content(transcript, str(video_path), options["language"], backend.name,
+                                            options["chunk_duration"], warnings, elapsed, metrics.snapshot())
+    }
+
+    for fmt, path in zip(formats, output_paths(output_dir, stem, formats)):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(contents[fmt](), encoding="utf-8")
+
+    message = (f"{elapsed:.1f}s, {len(text.split())} words, {len(failed)} failed chunks, "
+               f"{len(skipped)} skipped chunks, {len(warnings)} warnings")
+    return True, message, metrics.snapshot()
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("inputs", nargs="+", help="video or audio files, directories or glob patterns")
+    parser.add_argument("-o", "--output-dir", default="transcripts", help="where to write results")
+    parser.add_argument("-l", "--language", action="append", choices=list(SUPPORTED_LANGUAGES.keys()),
+                        help="repeat to recognize every chunk in several languages and keep the most "
+                             "confident (default: ar-SA)")
+    parser.add_argument("-b", "--backend", default=DEFAULT_BACKEND, choices=list(BACKENDS.keys()))
+    parser.add_argument("--chunk-duration", type=int, default=30, help="seconds per chunk")
+    parser.add_argument("--overlap", type=float, default=0.0,
+                        help="seconds each fixed window extends into the next, stitched afterwards")
+    parser.add_argument("--formats", default="txt,srt,json", help="comma separated: txt, srt, vtt, json")
+    parser.add_argument("-j", "--jobs", type=int, default=os.cpu_count() or 1, help="files processed in parallel")
+    parser.add_argument("--workers", type=int, default=DEFAULT_MAX_WORKERS, help="concurrent chunks per file")
+    parser.add_argument("--queue-size", type=int, default=DEFAULT_QUEUE_SIZE,
+                        help="chunks buffered between decoding, filtering and recognition; caps memory per file")
+    parser.add_argument("--requests-per-second", type=float, default=DEFAULT_REQUESTS_PER_SECOND,
+                        help="recognizer request budget shared by all jobs (0 = unlimited)")
+    parser.add_argument("--no-streaming", action="store_true", help="extract a WAV with moviepy and split on silence")
+    parser.add_argument("--no-speech-filter", action="store_true",
+                        help="send every chunk to the recognizer, even silence, music or noise")
+    parser.add_argument("--no-cache", action="store_true", help="do not read or write the transcript cache")
+    parser.add_argument("--resume", action="store_true",
+                        help="checkpoint finished chunks so an interrupted run continues where it stopped")
+    parser.add_argument("--metrics-file", help="write Prometheus-format totals for the whole batch here")
+    parser.add_argument("--overwrite", action="store_true", help="redo files whose outputs already exist")
+    args = parser.parse_args(argv)
+
+    args.language = args.language or ["ar-SA"]
+    args.formats = [fmt.strip() for fmt in args.formats.split(",") if fmt.strip()]
+    unknown = set(args.formats) - set(OUTPUT_FORMATS)
+    if unknown:
+        parser.error(f"unknown output formats: {', '.join(sorted(unknown))}")
+    if not 0 <= args.overlap < args.chunk_duration:
+        parser.error(f"--overlap must be at least 0 and less than --chunk-duration ({args.chunk_duration})")
+    return args
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    output_dir = Path(args.output_dir)
+
+    try:
+        videos = find_videos(args.inputs)
+    except ValueError as e:
+        print(f"❌ {e}")
+        return 1
+    if not args.overwrite:
+        videos = [(video, stem) for video, stem in videos
+                  if not all(path.exists() for path in output_paths(output_dir, stem, args.formats))]
+
+    if not videos:
+        print("❌ No videos to process")
+        return 1
+
+    jobs = max(1, min(args.jobs, len(videos)))
+    options = {
+        "language": args.language[0] if len(args.language) == 1 else args.language,
+        "chunk_duration": args.chunk_duration,
+        "overlap": args.overlap,
+        "speech_filter": not args.no_speech_filter,
+        "max_workers": args.workers,
+        "queue_size": args.queue_size,
+        "requests_per_second": args.requests_per_second / jobs,
+        "streaming": not args.no_streaming,
+        "backend": args.backend,
+        "use_cache": not args.no_cache,
+        "resumable": args.resume,
+    }
+
+    print(f"🎬 Transcribing {len(videos)} videos with {jobs} processes")
+    failures = 0
+    started = time.perf_counter()
+    registry = MetricsRegistry(args.metrics_file)
+
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        futures = {
+            executor.submit(process_file, video, stem, output_dir, args.formats, dict(options)): video
+            for video, stem in videos
+        }
+        for done, future in enumerate(as_completed(futures), start=1):
+            video = futures[future]
+            try:
+                ok, message, snapshot = future.result()
+                registry.record(snapshot, "done" if ok else "failed")
+            except Exception as e:
+                ok, message = False, str(e)
+
+            failures += not ok
+            print(f"{'✅' if ok else '❌'} [{done}/{len(videos)}] {video.name}: {message}")
+
+    print("=" * 50)
+    if args.metrics_file:
+        print(f"📊 Metrics written to {args.metrics_file}")
+    print(f"🏁 Done in {time.perf_counter() - started:.1f}s, {len(videos) - failures} succeeded, {failures} failed")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
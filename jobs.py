@@ -0,0 +1,146 @@
+"""
+Video Transcription Tool - Background Jobs
+Runs transcriptions on worker threads so they outlive Streamlit reruns
+"""
+
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+DEFAULT_MAX_JOBS = int(os.environ.get("TRANSCRIBE_MAX_JOBS", "2"))
+# Jobs allowed to wait for a worker before submit is refused; 0 means no limit
+DEFAULT_MAX_QUEUED_JOBS = int(os.environ.get("TRANSCRIBE_MAX_QUEUED_JOBS", "0"))
+# Finished jobs kept in the table before the oldest are dropped
+MAX_FINISHED_JOBS = 100
+
+
+class QueueFullError(Exception):
+    """Raised by JobManager.submit when max_queued jobs are already waiting"""
+
+
+class Job:
+    """State of one background job, updated by its worker thread"""
+
+    QUEUED = "queued"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+
+    def __init__(self, job_id: str, name: str):
+        self.id = job_id
+        self.name = name
+        self.status = Job.QUEUED
+        self.progress = 0
+        self.message = ""
+        self.result = None
+        self.partial: List = []
+        self.error: Optional[str] = None
+        self.warnings: List[str] = []
+        self.created_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+
+    @property
+    def finished(self) -> bool:
+        return self.status in (Job.DONE, Job.FAILED)
+
+    def update_progress(self, progress: int, message: str):
+        """Progress callback handed to the job function"""
+        self.progress = progress
+        self.message = message
+
+    def add_warning(self, message: str):
+        """Warning callback handed to the job function"""
+        self.warnings.append(message)
+
+    def add_partial(self, item):
+        """Partial-result callback handed to the job function"""
+        self.partial.append(item)
+
+
+class JobManager:
+    """Job table backed by a fixed pool of worker threads
+
+    Job functions are called with progress_callback, warning_callback and
+    partial_callback keyword arguments; their return value becomes
+    job.result and any exception marks the job as failed. With max_queued,
+    submit refuses new jobs while that many are waiting for a worker.
+    """
+
+    def __init__(self, max_workers: int = DEFAULT_MAX_JOBS, max_queued: int = DEFAULT_MAX_QUEUED_JOBS):
+        self.max_workers = max_workers
+        self.max_queued = max_queued
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="transcribe-job")
+        self._jobs: Dict[str, Job] = {}
+        self._lock = threading.Lock()
+
+    def submit(self, name: str, fn, *args, **kwargs) -> str:
+        """Queue fn(*args, **kwargs) and return the new job id
+
+        Raises QueueFullError when the queue is at max_queued.
+        """
+        job = Job(uuid.uuid4().hex, name)
+        with self._lock:
+            if self.max_queued and self._queued() >= self.max_queued:
+                raise QueueFullError(f"{self._queued()} jobs already waiting")
+            self._jobs[job.id] = job
+            self._prune()
+        self._executor.submit(self._run, job, fn, args, kwargs)
+        return job.id
+
+    def _run(self, job: Job, fn, args, kwargs):
+        # Timestamps, result and error are set before the status that readers
+        # check, and the status changes under the lock that _prune holds
+        with self._lock:
+            job.started_at = time.time()
+            job.status = Job.RUNNING
+        result, error, status = None, None, Job.DONE
+        try:
+            result = fn(*args, progress_callback=job.update_progress,
+                        warning_callback=job.add_warning, partial_callback=job.add_partial, **kwargs)
+        except Exception as e:
+            error, status = str(e), Job.FAILED
+        with self._lock:
+            job.finished_at = time.time()
+            job.result = result
+            job.error = error
+            job.status = status
+
+    def _queued(self) -> int:
+        return sum(1 for job in self._jobs.values() if job.status == Job.QUEUED)
+
+    def _prune(self):
+        finished = sorted((job for job in self._jobs.values() if job.finished), key=lambda job: job.finished_at)
+        for job in finished[:max(0, len(finished) - MAX_FINISHED_JOBS)]:
+            del self._jobs[job.id]
+
+    def get(self, job_id: str) -> Optional[Job]:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def remove(self, job_id: str) -> bool:
+        """Forget a finished job; False if it is unknown or still queued or running"""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None or not job.finished:
+                return False
+            del self._jobs[job_id]
+            return True
+
+    @property
+    def queue_depth(self) -> int:
+        """Number of jobs waiting for a worker"""
+        with self._lock:
+            return self._queued()
+
+    @property
+    def running(self) -> int:
+        """Number of jobs currently on a worker"""
+        with self._lock:
+            return sum(1 for job in self._jobs.values() if job.status == Job.RUNNING)
+
+    def shutdown(self, wait: bool = True):
+        self._executor.shutdown(wait=wait)
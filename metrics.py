@@ -0,0 +1,187 @@
+"""
+Video Transcription Tool - Metrics
+Per-stage timings and counters for each job, exported in Prometheus text format
+"""
+
+import logging
+import os
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, Iterable, Iterator, Optional
+
+METRICS_PREFIX = "transcribe"
+# Rewritten after every job when set, for a textfile collector to pick up
+DEFAULT_METRICS_FILE = os.environ.get("TRANSCRIBE_METRICS_FILE")
+DEFAULT_METRICS_PORT = int(os.environ.get("TRANSCRIBE_METRICS_PORT", "0"))
+
+logger = logging.getLogger(__name__)
+
+
+def format_value(value: float) -> str:
+    """Full-precision sample value for the text exposition format"""
+    value = float(value)
+    return str(int(value)) if value.is_integer() else repr(value)
+
+
+class Metrics:
+    """Thread-safe timings and counters collected while one job runs
+
+    Stages accumulate call count, total and maximum seconds, so a stage
+    timed per chunk (e.g. recognize) also gives its mean and worst latency.
+    """
+
+    def __init__(self):
+        self.stages: Dict[str, Dict[str, float]] = {}
+        self.counters: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, stage: str, seconds: float):
+        with self._lock:
+            entry = self.stages.setdefault(stage, {"count": 0, "seconds": 0.0, "max_seconds": 0.0})
+            entry["count"] += 1
+            entry["seconds"] += seconds
+            entry["max_seconds"] = max(entry["max_seconds"], seconds)
+
+    def inc(self, counter: str, value: float = 1):
+        with self._lock:
+            self.counters[counter] = self.counters.get(counter, 0) + value
+
+    @contextmanager
+    def timer(self, stage: str):
+        """Time the enclosed block as one call of stage"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(stage, time.perf_counter() - started)
+
+    def timed_iter(self, stage: str, iterable: Iterable) -> Iterator:
+        """Yield from iterable, timing each step as one call of stage"""
+        iterator = iter(iterable)
+        while True:
+            started = time.perf_counter()
+            try:
+                item = next(iterator)
+            except StopIteration:
+                return
+            self.observe(stage, time.perf_counter() - started)
+            yield item
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "stages": {stage: dict(entry) for stage, entry in self.stages.items()},
+                "counters": dict(self.counters),
+            }
+
+
+class MetricsRegistry:
+    """Process-wide totals of finished jobs plus live gauges
+
+    With a path, the export file is rewritten after every recorded job.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path
+        self.totals = Metrics()
+        self._gauges: Dict[str, Callable[[], float]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, snapshot: dict, status: str = "done"):
+        """Add a finished job's Metrics.snapshot() to the totals"""
+        totals = self.totals
+        with totals._lock:
+            for stage, entry in snapshot["stages"].items():
+                total = totals.stages.setdefault(stage, {"count": 0, "seconds": 0.0, "max_seconds": 0.0})
+                total["count"] += entry["count"]
+                total["seconds"] += entry["seconds"]
+                total["max_seconds"] = max(total["max_seconds"], entry["max_seconds"])
+            for counter, value in snapshot["counters"].items():
+                totals.counters[counter] = totals.counters.get(counter, 0) + value
+        totals.inc(f"jobs_{status}")
+
+        if self.path:
+            self.write(self.path)
+
+    @contextmanager
+    def track(self, metrics: Metrics):
+        """Record metrics when the enclosed job finishes, as done or failed"""
+        try:
+            yield metrics
+        except BaseException:
+            self.record(metrics.snapshot(), "failed")
+            raise
+        self.record(metrics.snapshot())
+
+    def register_gauge(self, name: str, fn: Callable[[], float]):
+        """Report fn() as gauge name at export time"""
+        with self._lock:
+            self._gauges[name] = fn
+
+    def to_prometheus(self) -> str:
+        snapshot = self.totals.snapshot()
+        lines = []
+
+        for series, kind, field in (("stage_seconds_total", "counter", "seconds"),
+                                    ("stage_calls_total", "counter", "count"),
+                                    ("stage_max_seconds", "gauge", "max_seconds")):
+            lines.append(f"# TYPE {METRICS_PREFIX}_{series} {kind}")
+            for stage, entry in sorted(snapshot["stages"].items()):
+                lines.append(f'{METRICS_PREFIX}_{series}{{stage="{stage}"}} {format_value(entry[field])}')
+
+        for counter, value in sorted(snapshot["counters"].items()):
+            lines.append(f"# TYPE {METRICS_PREFIX}_{counter}_total counter")
+            lines.append(f"{METRICS_PREFIX}_{counter}_total {format_value(value)}")
+
+        with self._lock:
+            gauges = sorted(self._gauges.items())
+        for name, fn in gauges:
+            lines.append(f"# TYPE {METRICS_PREFIX}_{name} gauge")
+            lines.append(f"{METRICS_PREFIX}_{name} {format_value(fn())}")
+
+        return "\n".join(lines) + "\n"
+
+    def write(self, path: str):
+        """Atomically replace path with the current export"""
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        with tempfile.NamedTemporaryFile("w", dir=directory, delete=False, suffix=".tmp") as f:
+            f.write(self.to_prometheus())
+        os.replace(f.name, path)
+
+
+REGISTRY = MetricsRegistry(DEFAULT_METRICS_FILE)
+
+
+def start_metrics_server(port: int, registry: MetricsRegistry = REGISTRY,
+                         host: str = "0.0.0.0") -> Optional[ThreadingHTTPServer]:
+    """Serve registry at http://host:port/metrics on a daemon thread
+
+    Returns None, after logging why, when the port cannot be bound.
+    """
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.rstrip("/") != "/metrics":
+                self.send_error(404)
+                return
+            body = registry.to_prometheus().encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    try:
+        server = ThreadingHTTPServer((host, port), Handler)
+    except OSError as e:
+        logger.warning("Metrics endpoint not started on port %d: %s", port, e)
+        return None
+    threading.Thread(target=server.serve_forever, daemon=True, name="metrics-server").start()
+    return server
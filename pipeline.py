@@ -0,0 +1,83 @@
+"""
+Video Transcription Tool - Staged Pipeline
+Bounded hand-off queues between pipeline stages, so a slow stage throttles the ones before it
+"""
+
+import os
+import queue
+import threading
+import time
+from typing import Iterable, Iterator, NamedTuple, Optional
+
+from metrics import Metrics
+
+# Items each queue between two stages may hold; with in-flight recognition
+# this caps the chunks a job keeps in memory
+DEFAULT_QUEUE_SIZE = int(os.environ.get("TRANSCRIBE_QUEUE_SIZE", "2"))
+
+# How often a producer blocked on a full queue checks whether the consumer went away
+_POLL_SECONDS = 0.1
+
+_DONE = object()
+
+
+class _Failure(NamedTuple):
+    """An exception raised by the producer, re-raised in the consumer"""
+    error: BaseException
+
+
+def staged(iterable: Iterable, maxsize: int = DEFAULT_QUEUE_SIZE, name: str = "stage",
+           metrics: Optional[Metrics] = None) -> Iterator:
+    """Run iterable on its own thread, handing items to the caller through a queue of at most maxsize
+
+    The producer blocks while the queue is full, so a slow consumer slows
+    the producer down instead of letting buffers grow. Exceptions raised
+    by the producer are re-raised in the consumer. Closing the returned
+    generator stops the producer and closes iterable on the producer's own
+    thread (e.g. killing an ffmpeg decoder). Time the producer spends
+    blocked is recorded in metrics as <name>_blocked, and time the consumer
+    waits for items as <name>_starved.
+    """
+    metrics = metrics or Metrics()
+    items = queue.Queue(maxsize=max(1, maxsize))
+    stop = threading.Event()
+
+    def put(item) -> bool:
+        started = time.perf_counter()
+        while not stop.is_set():
+            try:
+                items.put(item, timeout=_POLL_SECONDS)
+            except queue.Full:
+                continue
+            metrics.observe(f"{name}_blocked", time.perf_counter() - started)
+            return True
+        return False
+
+    def produce():
+        iterator = iter(iterable)
+        try:
+            for item in iterator:
+                if not put(item):
+                    return
+            put(_DONE)
+        except BaseException as e:
+            put(_Failure(e))
+        finally:
+            close = getattr(iterator, "close", None)
+            if close:
+                close()
+
+    thread = threading.Thread(target=produce, daemon=True, name=f"pipeline-{name}")
+    thread.start()
+    try:
+        while True:
+            with metrics.timer(f"{name}_starved"):
+                item = items.get()
+            if item is _DONE:
+                return
+            if isinstance(item, _Failure):
+                raise item.error
+            yield item
+    finally:
+        stop.set()
+        thread.join()
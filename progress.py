@@ -0,0 +1,203 @@
+"""
+Video Transcription Tool - Progress and ETA
+Duration-weighted job progress with a throughput-based estimate of the time left
+"""
+
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from collections import deque
+from typing import Dict, Optional
+
+# Measured throughput per backend and stage, in audio seconds per wall second
+DEFAULT_RATES_FILE = os.environ.get(
+    "TRANSCRIBE_RATES_FILE",
+    os.path.join(os.path.expanduser("~"), ".cache", "video-transcription", "rates.json")
+)
+# Rates assumed for a backend with no history yet
+DEFAULT_RATES = {"extract": 60.0, "recognize": 4.0}
+# Weight of each new job in the stored rate
+HISTORY_SMOOTHING = 0.3
+# Stages shorter than this say more about start-up cost than throughput
+MIN_MEASURED_SECONDS = 1.0
+
+# Recent completions used for the rolling rate, and how many seconds of
+# evidence the historical rate counts as until then
+ROLLING_WINDOW_SECONDS = 30.0
+PRIOR_WEIGHT_SECONDS = 5.0
+
+# Range of the progress bar the stages share; the rest is start-up and the final assembly
+PROGRESS_START = 5
+PROGRESS_END = 95
+
+logger = logging.getLogger(__name__)
+
+
+class RateHistory:
+    """Smoothed per-backend stage throughput kept in a small JSON file across runs"""
+
+    def __init__(self, path: Optional[str] = DEFAULT_RATES_FILE):
+        self.path = path
+        self._rates: Optional[Dict[str, Dict[str, float]]] = None
+        self._lock = threading.Lock()
+
+    def _load(self) -> Dict[str, Dict[str, float]]:
+        if self._rates is None:
+            self._rates = {}
+            if self.path:
+                try:
+                    with open(self.path, encoding="utf-8") as f:
+                        self._rates = json.load(f)
+                except (OSError, ValueError):
+                    pass
+        return self._rates
+
+    def rate(self, backend: str, stage: str) -> float:
+        """Expected audio seconds per wall second of stage on backend"""
+        with self._lock:
+            return self._load().get(backend, {}).get(stage, DEFAULT_RATES[stage])
+
+    def record(self, backend: str, stage: str, rate: float):
+        """Blend a job's measured rate into the history and save it"""
+        with self._lock:
+            rates = self._load().setdefault(backend, {})
+            previous = rates.get(stage)
+            rates[stage] = rate if previous is None else previous + HISTORY_SMOOTHING * (rate - previous)
+            if self.path:
+                try:
+                    self._save()
+                except OSError as e:
+                    logger.warning("Could not save throughput history to %s: %s", self.path, e)
+
+    def _save(self):
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        with tempfile.NamedTemporaryFile("w", dir=directory, delete=False, suffix=".tmp") as f:
+            json.dump(self._rates, f, indent=2)
+        os.replace(f.name, self.path)
+
+
+HISTORY = RateHistory()
+
+
+def format_eta(seconds: float) -> str:
+    seconds = max(0, round(seconds))
+    hours, seconds = divmod(seconds, 3600)
+    minutes, seconds = divmod(seconds, 60)
+    return f"{hours}:{minutes:02d}:{seconds:02d}" if hours else f"{minutes}:{seconds:02d}"
+
+
+class ProgressTracker:
+    """Turns processed audio seconds into a progress percentage and an ETA
+
+    Each stage's share of the bar is its expected duration, from the
+    backend's historical rate, so extraction of a long video is no longer a
+    flat 10%. During recognition the rate is a rolling window of recent
+    chunks blended with the historical rate, which dominates until a few
+    seconds of real throughput have been seen. Measured rates are added to
+    the history when the job finishes.
+    """
+
+    def __init__(self, callback=None, backend: str = "", history: RateHistory = HISTORY):
+        self.callback = callback
+        self.backend = backend
+        self.history = history
+        self.total_seconds: Optional[float] = None
+        self.stages = ["recognize"]
+        self.stage = "recognize"
+        self.processed = 0.0
+        self.measured = 0.0
+        self._stage_started = time.perf_counter()
+        self._stage_seconds: Dict[str, float] = {}
+        self._recent = deque()
+
+    def begin(self, total_seconds: Optional[float], extract: bool = False):
+        """Set the audio seconds of work ahead and whether an extraction stage precedes recognition"""
+        self.total_seconds = total_seconds
+        self.stages = ["extract", "recognize"] if extract else ["recognize"]
+        self.start_stage(self.stages[0])
+
+    def start_stage(self, stage: str):
+        now = time.perf_counter()
+        if self.stage != stage:
+            self._stage_seconds[self.stage] = now - self._stage_started
+        self.stage = stage
+        self._stage_started = now
+
+    def resumed(self, seconds: float):
+        """Count audio finished by an earlier run, without crediting it to this run's rate"""
+        self.processed += seconds
+
+    def expected_seconds(self, stage: str) -> float:
+        return (self.total_seconds or 0) / self.history.rate(self.backend, stage)
+
+    def recognize_rate(self) -> float:
+        """Rolling audio seconds per wall second, starting from the historical rate"""
+        now = time.perf_counter()
+        while self._recent and self._recent[0][0] < now - ROLLING_WINDOW_SECONDS:
+            self._recent.popleft()
+        span = now - max(self._stage_started, now - ROLLING_WINDOW_SECONDS)
+        recent_seconds = sum(seconds for _, seconds in self._recent)
+        prior = self.history.rate(self.backend, "recognize")
+        return (recent_seconds + prior * PRIOR_WEIGHT_SECONDS) / (span + PRIOR_WEIGHT_SECONDS)
+
+    def fraction(self) -> Optional[float]:
+        """Share of the whole job done, or None without a known total"""
+        if not self.total_seconds:
+            return None
+        expected = {stage: self.expected_seconds(stage) for stage in self.stages}
+        total_expected = sum(expected.values()) or 1.0
+        done = 0.0
+        for stage in self.stages:
+            if stage == self.stage:
+                if stage == "recognize":
+                    done += expected[stage] * min(1.0, self.processed / self.total_seconds)
+                else:
+                    elapsed = time.perf_counter() - self._stage_started
+                    done += expected[stage] * min(0.9, elapsed / expected[stage]) if expected[stage] else 0.0
+                break
+            done += expected[stage]
+        return done / total_expected
+
+    def eta(self) -> Optional[float]:
+        """Seconds left, or None without a known total"""
+        if not self.total_seconds:
+            return None
+        remaining_audio = max(0.0, self.total_seconds - self.processed)
+        if self.stage == "recognize":
+            return remaining_audio / self.recognize_rate()
+        elapsed = time.perf_counter() - self._stage_started
+        return max(0.0, self.expected_seconds("extract") - elapsed) + self.expected_seconds("recognize")
+
+    def report(self, message: str):
+        """Send the current progress and message, with the ETA appended when known"""
+        if not self.callback:
+            return
+        fraction = self.fraction()
+        progress = PROGRESS_START + round((PROGRESS_END - PROGRESS_START) * (fraction or 0.0))
+        eta = self.eta()
+        if eta is not None:
+            message = f"{message} ⏳ متبقي حوالي {format_eta(eta)}"
+        self.callback(progress, message)
+
+    def chunk_done(self, seconds: float, message: str):
+        """Record a recognized chunk of seconds and report"""
+        self.processed += seconds
+        self.measured += seconds
+        self._recent.append((time.perf_counter(), seconds))
+        self.report(message)
+
+    def finish(self):
+        """Add this run's measured rates to the history"""
+        self.start_stage("done")
+        if not self.total_seconds:
+            return
+        extract_seconds = self._stage_seconds.get("extract", 0.0)
+        if extract_seconds >= MIN_MEASURED_SECONDS:
+            self.history.record(self.backend, "extract", self.total_seconds / extract_seconds)
+        recognize_seconds = self._stage_seconds.get("recognize", 0.0)
+        if recognize_seconds >= MIN_MEASURED_SECONDS and self.measured:
+            self.history.record(self.backend, "recognize", self.measured / recognize_seconds)
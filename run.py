@@ -7,6 +7,7 @@ This script starts the Streamlit application
 import subprocess
 import sys
 import os
+from importlib.util import find_spec
 
 def check_dependencies():
     """Check if required dependencies are installed"""
@@ -19,10 +20,9 @@ def check_dependencies():
     
     missing_packages = []
     
+    # find_spec locates packages without importing them, which is much faster for moviepy
     for package in required_packages:
-        try:
-            __import__(package)
-        except ImportError:
+        if find_spec(package) is None:
             missing_packages.append(package)
     
     if missing_packages:
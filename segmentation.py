@@ -0,0 +1,260 @@
+"""
+Video Transcription Tool - Audio Segmentation
+Vectorized silence detection and lazy chunk views over raw PCM samples
+"""
+
+import math
+import wave
+from typing import List, NamedTuple, Sequence
+
+import numpy as np
+
+# Milliseconds of audio squared per block while computing slice energy
+ENERGY_BLOCK_MS = 60000
+
+_SAMPLE_DTYPES = {1: np.int8, 2: np.int16, 4: np.int32}
+
+
+def pcm_samples(audio) -> np.ndarray:
+    """View interleaved PCM data (AudioSegment or PcmAudio) as a NumPy array without copying"""
+    try:
+        dtype = _SAMPLE_DTYPES[audio.sample_width]
+    except KeyError:
+        raise ValueError(f"Unsupported sample width: {audio.sample_width}")
+    return np.frombuffer(audio.raw_data, dtype=np.dtype(dtype).newbyteorder("<"))
+
+
+class ChunkSpan(NamedTuple):
+    """Frame offsets of one chunk inside a PcmAudio buffer"""
+    start: int
+    end: int
+
+
+class PcmAudio:
+    """Interleaved PCM audio held in a single shared buffer
+
+    Exposes the same raw_data / frame_rate / sample_width / channels
+    attributes as pydub's AudioSegment, but slicing returns memoryviews
+    instead of copies. start_frame records where the audio sits in the
+    original source so chunks keep their real timestamps.
+    """
+
+    def __init__(self, data, frame_rate: int, sample_width: int, channels: int, start_frame: int = 0):
+        self.raw_data = memoryview(data).cast("B")
+        self.frame_rate = frame_rate
+        self.sample_width = sample_width
+        self.channels = channels
+        self.start_frame = start_frame
+
+    @classmethod
+    def from_wav(cls, path: str) -> "PcmAudio":
+        """Read a PCM WAV file into one buffer"""
+        with wave.open(path, "rb") as wav:
+            return cls(wav.readframes(wav.getnframes()), wav.getframerate(), wav.getsampwidth(), wav.getnchannels())
+
+    @classmethod
+    def from_segment(cls, audio) -> "PcmAudio":
+        """Wrap an AudioSegment's data without copying it"""
+        return cls(audio.raw_data, audio.frame_rate, audio.sample_width, audio.channels)
+
+    @property
+    def frame_width(self) -> int:
+        return self.sample_width * self.channels
+
+    @property
+    def frame_count(self) -> int:
+        return len(self.raw_data) // self.frame_width
+
+    def __len__(self) -> int:
+        """Length in milliseconds, rounded like AudioSegment"""
+        return round(1000 * self.frame_count / self.frame_rate)
+
+    @property
+    def start_seconds(self) -> float:
+        return self.start_frame / self.frame_rate
+
+    @property
+    def end_seconds(self) -> float:
+        return (self.start_frame + self.frame_count) / self.frame_rate
+
+    @property
+    def rms(self) -> float:
+        samples = pcm_samples(self)
+        if not len(samples):
+            return 0.0
+        block = ENERGY_BLOCK_MS * self.frame_rate // 1000 * self.channels
+        total = sum(float(np.dot(part, part)) for part in
+                    (samples[i:i + block].astype(np.float64) for i in range(0, len(samples), block)))
+        return math.sqrt(total / len(samples))
+
+    @property
+    def dBFS(self) -> float:
+        rms = self.rms
+        if not rms:
+            return -float("inf")
+        return 20 * math.log10(rms / (2 ** (self.sample_width * 8) / 2))
+
+    def view(self, start: int, end: int) -> memoryview:
+        """Zero-copy view of frames [start, end)"""
+        return self.raw_data[start * self.frame_width:end * self.frame_width]
+
+    def slice(self, start: int, end: int) -> "PcmAudio":
+        """Frames [start, end) as a PcmAudio sharing this buffer"""
+        return PcmAudio(self.view(start, end), self.frame_rate, self.sample_width, self.channels,
+                        self.start_frame + start)
+
+    def to_segment(self):
+        """Copy into a pydub AudioSegment"""
+        from pydub import AudioSegment
+        return AudioSegment(data=self.raw_data.tobytes(), sample_width=self.sample_width,
+                            frame_rate=self.frame_rate, channels=self.channels)
+
+    def mono(self) -> "PcmAudio":
+        """Downmix to one channel by averaging, returning self if already mono"""
+        if self.channels == 1:
+            return self
+        samples = pcm_samples(self).reshape(-1, self.channels)
+        mixed = samples.mean(axis=1).astype(samples.dtype)
+        return PcmAudio(mixed.tobytes(), self.frame_rate, self.sample_width, 1, self.start_frame)
+
+    def convert(self, frame_rate: int, sample_width: int, channels: int) -> "PcmAudio":
+        """Return audio in the given format, converting through pydub only when it differs"""
+        if (self.frame_rate, self.sample_width, self.channels) == (frame_rate, sample_width, channels):
+            return self
+        segment = self.to_segment().set_channels(channels).set_frame_rate(frame_rate).set_sample_width(sample_width)
+        converted = PcmAudio.from_segment(segment)
+        converted.start_frame = self.start_frame * frame_rate // self.frame_rate
+        return converted
+
+    def fixed_spans(self, chunk_length_ms: int, overlap_ms: int = 0) -> List[ChunkSpan]:
+        """Split into spans starting every chunk_length_ms, each extended overlap_ms into the next"""
+        step = max(1, chunk_length_ms * self.frame_rate // 1000)
+        overlap = overlap_ms * self.frame_rate // 1000
+        total = self.frame_count
+        return [ChunkSpan(start, min(start + step + overlap, total)) for start in range(0, total, step)]
+
+
+class ChunkedAudio(Sequence):
+    """Chunk spans over one PcmAudio buffer, yielded as zero-copy PcmAudio views"""
+
+    def __init__(self, audio: PcmAudio, spans: List[ChunkSpan]):
+        self.audio = audio
+        self.spans = spans
+
+    def __len__(self) -> int:
+        return len(self.spans)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return ChunkedAudio(self.audio, self.spans[index])
+        return self.audio.slice(*self.spans[index])
+
+    @property
+    def seconds(self) -> float:
+        """Audio in all chunks together, counting overlaps once per chunk"""
+        return sum(span.end - span.start for span in self.spans) / self.audio.frame_rate
+
+
+def _ms_energy(samples: np.ndarray, frame_bounds: np.ndarray, channels: int, wide: bool) -> np.ndarray:
+    """Sum of squared samples inside each millisecond slice"""
+    sample_bounds = np.minimum(frame_bounds * channels, len(samples))
+    n_ms = len(frame_bounds) - 1
+    energy = np.zeros(n_ms, dtype=np.float64 if wide else np.int64)
+
+    for block_start in range(0, n_ms, ENERGY_BLOCK_MS):
+        block_end = min(block_start + ENERGY_BLOCK_MS, n_ms)
+        lo, hi = sample_bounds[block_start], sample_bounds[block_end]
+        if hi <= lo:
+            break
+
+        block = samples[lo:hi].astype(energy.dtype)
+        block *= block
+        starts = sample_bounds[block_start:block_end] - lo
+        valid = starts < len(block)
+        energy[block_start:block_end][valid] = np.add.reduceat(block, starts[valid])
+
+    return energy
+
+
+def detect_nonsilent_ms(audio, min_silence_len: int = 1000, silence_thresh: float = -16) -> List[List[int]]:
+    """Return [start, end] millisecond ranges that are not silent
+
+    Matches pydub.silence.detect_nonsilent with seek_step=1: a window of
+    min_silence_len ms starting at every millisecond is silent when its RMS
+    is at or below silence_thresh dBFS, and overlapping silent windows merge
+    into one range. Window energies come from a single cumulative sum
+    instead of one Python-level slice per millisecond.
+    """
+    frame_rate = audio.frame_rate
+    channels = audio.channels
+    samples = pcm_samples(audio)
+    seg_len = round(1000 * (len(samples) // channels) / frame_rate)
+
+    if seg_len < min_silence_len:
+        return [[0, seg_len]]
+
+    max_amplitude = 2 ** (audio.sample_width * 8) / 2
+    thresh = 10 ** (silence_thresh / 20) * max_amplitude
+
+    frame_bounds = (np.arange(seg_len + 1) * (frame_rate / 1000.0)).astype(np.int64)
+    wide = audio.sample_width > 2
+    cumulative = np.zeros(seg_len + 1, dtype=np.float64 if wide else np.int64)
+    np.cumsum(_ms_energy(samples, frame_bounds, channels, wide), out=cumulative[1:])
+
+    # Mean square of every min_silence_len window, padded windows count zeros like pydub
+    window_sum = cumulative[min_silence_len:] - cumulative[:-min_silence_len]
+    window_len = (frame_bounds[min_silence_len:] - frame_bounds[:-min_silence_len]) * channels
+    rms = np.floor(np.sqrt(window_sum / np.maximum(window_len, 1)))
+
+    silence_starts = np.flatnonzero(rms <= thresh)
+    if not len(silence_starts):
+        return [[0, seg_len]]
+
+    breaks = np.flatnonzero(np.diff(silence_starts) > min_silence_len)
+    range_starts = silence_starts[np.concatenate(([0], breaks + 1))]
+    range_ends = silence_starts[np.concatenate((breaks, [len(silence_starts) - 1]))] + min_silence_len
+    silent_ranges = list(zip(range_starts.tolist(), range_ends.tolist()))
+
+    if silent_ranges[0] == (0, seg_len):
+        return []
+
+    nonsilent_ranges = []
+    prev_end = 0
+    for start, end in silent_ranges:
+        nonsilent_ranges.append([prev_end, start])
+        prev_end = end
+
+    if prev_end != seg_len:
+        nonsilent_ranges.append([prev_end, seg_len])
+
+    if nonsilent_ranges[0] == [0, 0]:
+        nonsilent_ranges.pop(0)
+
+    return nonsilent_ranges
+
+
+def split_on_silence_ranges(audio, min_silence_len: int = 1000, silence_thresh: float = -16,
+                            keep_silence: int = 100) -> List[ChunkSpan]:
+    """Return (start, end) frame offsets of the chunks pydub's split_on_silence would produce
+
+    Unlike pydub, a range ending past the last frame is clamped rather than
+    padded with a few frames of silence.
+    """
+    seg_len = len(audio)
+    frame_count = len(audio.raw_data) // (audio.sample_width * audio.channels)
+    output_ranges = [
+        [start - keep_silence, end + keep_silence]
+        for start, end in detect_nonsilent_ms(audio, min_silence_len, silence_thresh)
+    ]
+
+    # Share the kept silence between neighbours whose padding overlaps
+    for range_i, range_ii in zip(output_ranges, output_ranges[1:]):
+        if range_ii[0] < range_i[1]:
+            range_i[1] = (range_i[1] + range_ii[0]) // 2
+            range_ii[0] = range_i[1]
+
+    frames_per_ms = audio.frame_rate / 1000.0
+    return [
+        ChunkSpan(int(max(start, 0) * frames_per_ms), min(int(min(end, seg_len) * frames_per_ms), frame_count))
+        for start, end in output_ranges
+    ]
@@ -0,0 +1,93 @@
+"""
+Video Transcription Tool - Speech Pre-Filter
+Cheap NumPy features that flag silent, music-only or noise-only chunks before recognition
+"""
+
+from typing import NamedTuple, Optional
+
+import numpy as np
+
+from segmentation import PcmAudio, pcm_samples
+
+# Reasons a chunk is skipped
+SILENCE = "silence"
+MUSIC = "music"
+NOISE = "noise"
+
+# Frames analysed per chunk for spectral features, spread evenly across it
+MAX_SPECTRAL_FRAMES = 400
+
+
+class SkippedRange(NamedTuple):
+    """A chunk that was not sent to the recognizer, in seconds"""
+    start: float
+    end: float
+    reason: str
+
+
+class SpeechFilter:
+    """Classify a chunk as speech or not from frame energy and spectral shape
+
+    Features, over 25 ms frames:
+
+    - active ratio: frames louder than silence_db; almost none means silence
+    - low-energy ratio: frames quieter than half the mean energy. Speech
+      pauses between syllables and words; continuous music or hum rarely does
+    - speech-band ratio: share of spectral power between 300 and 3400 Hz
+    - spectral flatness: close to 1 for broadband noise, low for voiced
+      speech and tonal music
+
+    Spectral features use only the louder half of the active frames.
+
+    The thresholds are deliberately conservative: a chunk is only skipped
+    when it is clearly not speech, because a skipped chunk loses its text
+    while a wasted request only costs time.
+    """
+
+    frame_ms = 25
+    silence_db = -45.0
+    min_active_ratio = 0.03
+    min_low_energy_ratio = 0.08
+    min_speech_band_ratio = 0.2
+    max_flatness = 0.5
+
+    def classify(self, chunk: PcmAudio) -> Optional[str]:
+        """Return why chunk is not speech, or None when it may contain speech"""
+        mono = chunk.mono()
+        samples = pcm_samples(mono).astype(np.float32) / float(2 ** (8 * mono.sample_width - 1))
+        frame_length = max(1, mono.frame_rate * self.frame_ms // 1000)
+        frame_count = len(samples) // frame_length
+        if frame_count == 0:
+            return SILENCE
+
+        frames = samples[:frame_count * frame_length].reshape(frame_count, frame_length)
+        energy = np.mean(frames * frames, axis=1)
+        energy_db = 10 * np.log10(energy + 1e-12)
+
+        active = energy_db > self.silence_db
+        if active.mean() < self.min_active_ratio:
+            return SILENCE
+
+        # Sustained sound without the dips between syllables and words
+        low_energy_ratio = np.mean(energy < 0.5 * energy.mean())
+
+        # Spectral shape of the louder half of active frames, so a noise floor
+        # between syllables does not outvote the speech itself
+        loud = active & (energy >= np.median(energy[active]))
+        active_frames = frames[loud]
+        if len(active_frames) > MAX_SPECTRAL_FRAMES:
+            active_frames = active_frames[np.linspace(0, len(active_frames) - 1, MAX_SPECTRAL_FRAMES).astype(int)]
+        power = np.abs(np.fft.rfft(active_frames * np.hanning(frame_length), axis=1)) ** 2 + 1e-12
+        frequencies = np.fft.rfftfreq(frame_length, 1 / mono.frame_rate)
+
+        speech_band = (frequencies >= 300) & (frequencies <= 3400)
+        speech_band_ratio = power[:, speech_band].sum() / power.sum()
+        flatness = np.median(np.exp(np.mean(np.log(power), axis=1)) / np.mean(power, axis=1))
+
+        if flatness > self.max_flatness:
+            return NOISE
+        if speech_band_ratio < self.min_speech_band_ratio:
+            return MUSIC
+        if low_energy_ratio < self.min_low_energy_ratio:
+            return MUSIC
+        return None
@@ -0,0 +1,113 @@
+"""
+Video Transcription Tool - Overlap Stitching
+Merges transcripts of overlapping chunk windows without repeating boundary words
+"""
+
+import math
+import re
+from typing import List, Sequence, Tuple
+
+from subtitles import Segment
+
+# Shortest shared run of words trusted as the same speech in both windows
+MIN_MATCH_WORDS = 2
+# How many times the evenly-spread estimate of the words in an overlap are searched for a match
+OVERLAP_SLACK = 1.5
+
+_PUNCTUATION = re.compile(r"[^\w']+")
+
+
+def normalize_word(word: str) -> str:
+    return _PUNCTUATION.sub("", word.lower())
+
+
+def longest_common_run(left: Sequence[str], right: Sequence[str]) -> Tuple[int, int, int]:
+    """Longest contiguous run of equal words as (left start, right start, length)
+
+    Of equally long runs, the one nearest the end of left and the start of
+    right wins, since that is where the two windows meet.
+    """
+    best = (0, 0, 0)
+    best_distance = 0
+    # lengths[j] = length of the common run ending at left[i - 1], right[j - 1]
+    lengths = [0] * (len(right) + 1)
+    for i in range(1, len(left) + 1):
+        previous_diagonal = 0
+        for j in range(1, len(right) + 1):
+            above = lengths[j]
+            if left[i - 1] and left[i - 1] == right[j - 1]:
+                lengths[j] = previous_diagonal + 1
+                distance = (len(left) - i) + (j - lengths[j])
+                if lengths[j] > best[2] or (lengths[j] == best[2] and distance < best_distance):
+                    best = (i - lengths[j], j - lengths[j], lengths[j])
+                    best_distance = distance
+            else:
+                lengths[j] = 0
+            previous_diagonal = above
+    return best
+
+
+def overlap_word_budget(segment: Segment, overlap: float, word_count: int) -> int:
+    """Words of a segment that can fall inside the overlap, with some slack for uneven speech
+
+    A window much wider than the overlap invites spurious matches on common
+    words, so the slack stays small.
+    """
+    duration = segment.end - segment.start
+    if duration <= 0:
+        return word_count
+    return min(word_count, math.ceil(word_count * overlap / duration * OVERLAP_SLACK) + 1)
+
+
+def stitch_pair(left: Segment, right: Segment) -> Tuple[Segment, Segment]:
+    """Remove the words two overlapping segments share, splitting the overlap between them
+
+    The overlapping tail of left and head of right are aligned on their
+    longest common run of words: left keeps everything up to the end of the
+    run and right starts after it. Without a reliable match, each side
+    drops the words estimated to lie in the other half of the overlap.
+    When one side is empty (no speech or a failed chunk) the other keeps
+    all of its words.
+    """
+    overlap = left.end - right.start
+    if overlap <= 0:
+        return left, right
+
+    left_words = left.text.split()
+    right_words = right.text.split()
+    midpoint = right.start + overlap / 2
+    if not left_words or not right_words:
+        return left._replace(end=midpoint), right._replace(start=midpoint)
+    tail_size = overlap_word_budget(left, overlap, len(left_words))
+    head_size = overlap_word_budget(right, overlap, len(right_words))
+    tail_offset = len(left_words) - tail_size
+
+    left_start, right_start, length = longest_common_run(
+        [normalize_word(word) for word in left_words[tail_offset:]],
+        [normalize_word(word) for word in right_words[:head_size]]
+    )
+
+    if length >= min(MIN_MATCH_WORDS, tail_size, head_size) and length > 0:
+        keep_left = tail_offset + left_start + length
+        skip_right = right_start + length
+    else:
+        # Assume words are spread evenly and cut both at the middle of the overlap
+        keep_left = len(left_words) - round(len(left_words) * (left.end - midpoint) / (left.end - left.start))
+        skip_right = round(len(right_words) * (midpoint - right.start) / (right.end - right.start))
+
+    return (left._replace(end=midpoint, text=" ".join(left_words[:keep_left])),
+            right._replace(start=midpoint, text=" ".join(right_words[skip_right:])))
+
+
+def stitch_segments(segments: Sequence[Segment]) -> List[Segment]:
+    """Stitch segments sorted by start so that overlapping windows no longer repeat text
+
+    Segments that do not overlap their predecessor are left untouched, so
+    this is a no-op for back-to-back or silence-split chunks.
+    """
+    stitched: List[Segment] = []
+    for segment in segments:
+        if stitched and stitched[-1].end > segment.start:
+            stitched[-1], segment = stitch_pair(stitched[-1], segment)
+        stitched.append(segment)
+    return stitched
@@ -0,0 +1,80 @@
+"""
+Video Transcription Tool - Subtitles
+Timed transcript segments and SRT / WebVTT writers
+"""
+
+from typing import Iterable, Iterator, List, NamedTuple, Optional
+
+# Longest cue, in words, before a segment is split across several cues
+DEFAULT_MAX_CUE_WORDS = 16
+
+
+class Segment(NamedTuple):
+    """Recognized text with its position in the source, in seconds, and its language code"""
+    start: float
+    end: float
+    text: str
+    language: str = ""
+
+
+def split_segment(segment: Segment, max_words: int = DEFAULT_MAX_CUE_WORDS) -> List[Segment]:
+    """Split a long segment into cues, sharing its duration in proportion to word count"""
+    words = segment.text.split()
+    if len(words) <= max_words:
+        return [segment]
+
+    groups = [words[i:i + max_words] for i in range(0, len(words), max_words)]
+    seconds_per_word = (segment.end - segment.start) / len(words)
+    cues = []
+    start = segment.start
+    for group in groups:
+        end = start + seconds_per_word * len(group)
+        cues.append(segment._replace(start=start, end=end, text=" ".join(group)))
+        start = end
+    return cues
+
+
+def iter_cues(segments: Iterable[Segment], max_words: Optional[int] = DEFAULT_MAX_CUE_WORDS) -> Iterator[Segment]:
+    """Non-empty segments in order, split into readable cues"""
+    for segment in segments:
+        if not segment.text.strip():
+            continue
+        if max_words:
+            yield from split_segment(segment, max_words)
+        else:
+            yield segment
+
+
+def format_timestamp(seconds: float, decimal_marker: str = ",") -> str:
+    """Format seconds as HH:MM:SS,mmm (SRT) or HH:MM:SS.mmm (WebVTT)"""
+    milliseconds = max(0, round(seconds * 1000))
+    hours, milliseconds = divmod(milliseconds, 3600000)
+    minutes, milliseconds = divmod(milliseconds, 60000)
+    seconds, milliseconds = divmod(milliseconds, 1000)
+    return f"{hours:02d}:{minutes:02d}:{seconds:02d}{decimal_marker}{milliseconds:03d}"
+
+
+def iter_srt(segments: Iterable[Segment], max_words: Optional[int] = DEFAULT_MAX_CUE_WORDS) -> Iterator[str]:
+    """Yield SRT cue blocks one at a time"""
+    for index, cue in enumerate(iter_cues(segments, max_words), start=1):
+        yield (f"{index}\n"
+               f"{format_timestamp(cue.start)} --> {format_timestamp(cue.end)}\n"
+               f"{cue.text.strip()}\n\n")
+
+
+def iter_vtt(segments: Iterable[Segment], max_words: Optional[int] = DEFAULT_MAX_CUE_WORDS) -> Iterator[str]:
+    """Yield the WebVTT header followed by one cue block at a time"""
+    yield "WEBVTT\n\n"
+    for cue in iter_cues(segments, max_words):
+        yield (f"{format_timestamp(cue.start, '.')} --> {format_timestamp(cue.end, '.')}\n"
+               f"{cue.text.strip()}\n\n")
+
+
+def create_srt_content(segments: Iterable[Segment], max_words: Optional[int] = DEFAULT_MAX_CUE_WORDS) -> str:
+    """Create SRT subtitle content from timed segments"""
+    return "".join(iter_srt(segments, max_words))
+
+
+def create_vtt_content(segments: Iterable[Segment], max_words: Optional[int] = DEFAULT_MAX_CUE_WORDS) -> str:
+    """Create WebVTT subtitle content from timed segments"""
+    return "".join(iter_vtt(segments, max_words))
@@ -0,0 +1,138 @@
+"""
+Video Transcription Tool - Request Throttling
+Rate limiting, retry with backoff and adaptive concurrency for recognizer calls
+"""
+
+import os
+import random
+import threading
+import time
+from contextlib import contextmanager
+
+from backends import BackendError, BackendUnavailableError, ThrottledError
+
+DEFAULT_MAX_ATTEMPTS = int(os.environ.get("TRANSCRIBE_MAX_ATTEMPTS", "4"))
+
+# Error classes returned by classify_error
+THROTTLED = "throttled"
+TRANSIENT = "transient"
+FATAL = "fatal"
+
+
+def classify_error(error: Exception) -> str:
+    """Whether a recognizer error means slow down, try again, or give up"""
+    if isinstance(error, ThrottledError):
+        return THROTTLED
+    if isinstance(error, BackendUnavailableError):
+        return FATAL
+    if isinstance(error, (BackendError, ConnectionError, TimeoutError)):
+        return TRANSIENT
+    return FATAL
+
+
+class RateLimiter:
+    """Thread-safe token bucket limiting how many requests start per second"""
+
+    def __init__(self, rate: float, burst: int = 1):
+        self.rate = rate
+        self.capacity = max(1, burst)
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Block until a request token is available"""
+        if self.rate <= 0:
+            return
+
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+
+                wait = (1 - self._tokens) / self.rate
+
+            time.sleep(wait)
+
+
+class RetryPolicy:
+    """Exponential backoff with full jitter for retryable recognizer errors"""
+
+    def __init__(self, max_attempts: int = DEFAULT_MAX_ATTEMPTS, base_delay: float = 0.5, max_delay: float = 10.0):
+        self.max_attempts = max(1, max_attempts)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    def should_retry(self, error_class: str, attempt: int) -> bool:
+        return error_class != FATAL and attempt < self.max_attempts
+
+    def delay(self, attempt: int) -> float:
+        """Seconds to wait after the given failed attempt, counting from 1"""
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** (attempt - 1)))
+
+
+class AdaptiveThrottle:
+    """AIMD controller for concurrent recognizer requests
+
+    Every success additively raises the concurrency limit (by about one per
+    round of requests) and the request rate, up to the configured maximums;
+    a throttled or transient error halves both, at most once per cooldown so
+    a burst of failures from the same round counts once. Under sustained
+    throttling the limits oscillate just below what the service accepts.
+    """
+
+    decrease_factor = 0.5
+    cooldown = 1.0
+
+    def __init__(self, max_concurrency: int, requests_per_second: float = 0.0):
+        self.max_concurrency = max(1, max_concurrency)
+        self.max_rate = requests_per_second
+        self.limit = float(self.max_concurrency)
+        self.rate_limiter = RateLimiter(requests_per_second, burst=self.max_concurrency)
+        self.successes = 0
+        self.errors = 0
+        self._in_flight = 0
+        self._last_decrease = 0.0
+        self._condition = threading.Condition()
+
+    @contextmanager
+    def slot(self):
+        """Hold one request slot within the current concurrency and rate limits"""
+        with self._condition:
+            while self._in_flight >= int(self.limit):
+                self._condition.wait()
+            self._in_flight += 1
+        try:
+            self.rate_limiter.acquire()
+            yield
+        finally:
+            with self._condition:
+                self._in_flight -= 1
+                self._condition.notify_all()
+
+    def on_success(self):
+        with self._condition:
+            self.successes += 1
+            self.limit = min(self.max_concurrency, self.limit + 1 / self.limit)
+            if self.max_rate > 0:
+                self.rate_limiter.rate = min(self.max_rate, self.rate_limiter.rate + self.max_rate / 20)
+            self._condition.notify_all()
+
+    def on_error(self, error_class: str):
+        with self._condition:
+            self.errors += 1
+            if error_class == FATAL:
+                return
+
+            now = time.monotonic()
+            if now - self._last_decrease < self.cooldown:
+                return
+            self._last_decrease = now
+            self.limit = max(1.0, self.limit * self.decrease_factor)
+            if self.max_rate > 0:
+                self.rate_limiter.rate = max(self.max_rate / 20, self.rate_limiter.rate * self.decrease_factor)
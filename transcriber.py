@@ -0,0 +1,701 @@
+"""
+Video Transcription Tool - Transcription Pipeline
+Audio extraction, chunking, recognition and subtitle export with no UI dependency
+"""
+
+import json
+import logging
+import os
+import re
+import shutil
+import subprocess
+import tempfile
+import time
+from contextlib import nullcontext
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from typing import Optional, List, Iterable, Iterator, NamedTuple, Sequence, Tuple, Union
+
+from backends import (DEFAULT_AUDIO_FORMAT, AudioFormat, BackendError, NoSpeechError, Recognition,
+                      RecognizerBackend, get_backend)
+from cache import TranscriptCache
+from checkpoint import Checkpoint
+from metrics import Metrics
+from pipeline import DEFAULT_QUEUE_SIZE, staged
+from progress import ProgressTracker
+from segmentation import ChunkedAudio, PcmAudio, split_on_silence_ranges
+from speech_filter import SkippedRange, SpeechFilter
+from stitching import stitch_segments
+from subtitles import Segment
+from throttle import AdaptiveThrottle, RetryPolicy, classify_error
+
+# Configuration
+SUPPORTED_VIDEO_FORMATS = ['.mp4', '.avi', '.mov', '.mkv', '.webm', '.flv', '.m4v']
+# Audio files are decoded by ffmpeg straight to PCM, never through moviepy
+SUPPORTED_AUDIO_FORMATS = ['.mp3', '.m4a', '.wav', '.ogg', '.oga', '.opus', '.flac', '.aac', '.wma']
+SUPPORTED_FORMATS = SUPPORTED_VIDEO_FORMATS + SUPPORTED_AUDIO_FORMATS
+SUPPORTED_LANGUAGES = {
+    'ar-SA': 'العربية',
+    'en-US': 'English',
+    'fr-FR': 'Français',
+    'de-DE': 'Deutsch',
+    'es-ES': 'Español',
+    'it-IT': 'Italiano',
+    'ja-JP': '日本語',
+    'ko-KR': '한국어',
+    'zh-CN': '中文'
+}
+
+# Temporary copies of uploads and extracted audio go here (e.g. a tmpfs mount);
+# unset means the system temp directory
+SCRATCH_DIR = os.environ.get("TRANSCRIBE_SCRATCH_DIR") or None
+# Block size used when copying uploads to the scratch directory
+COPY_BUFFER_SIZE = 1024 * 1024
+
+# Concurrency settings for chunk recognition
+DEFAULT_MAX_WORKERS = 4
+MAX_WORKERS_LIMIT = 8
+DEFAULT_REQUESTS_PER_SECOND = 2.0
+
+# ffmpeg raw sample formats for each PCM sample width
+PCM_SAMPLE_FORMATS = {2: "s16le", 4: "s32le"}
+
+logger = logging.getLogger(__name__)
+
+class TranscriptionError(Exception):
+    """Raised with a user-facing message when a pipeline stage fails"""
+
+class MediaInfo(NamedTuple):
+    """What ffmpeg reports about a file's streams; cover art does not count as video"""
+    duration: Optional[float]
+    has_audio: bool
+    has_video: bool
+
+class Transcript(NamedTuple):
+    """Full text of a job plus every chunk's timed segment, the failed chunks and those skipped as non-speech"""
+    text: str
+    segments: List[Segment]
+    failed: List[Segment] = []
+    skipped: List[SkippedRange] = []
+
+def extract_audio_from_video(video_path: str, output_path: str,
+                             audio_format: AudioFormat = DEFAULT_AUDIO_FORMAT):
+    """Extract audio from video file, downmixed and resampled to audio_format"""
+    try:
+        # moviepy is slow to import and only needed when not streaming
+        from moviepy.editor import VideoFileClip
+        
+        with VideoFileClip(video_path) as video:
+            if video.audio is None:
+                raise TranscriptionError("❌ الفيديو لا يحتوي على مسار صوتي")
+            
+            audio = video.audio
+            # Convert to wav format for better compatibility, letting ffmpeg
+            # resample once to the recognizer's native format
+            audio.write_audiofile(
+                output_path,
+                nbytes=audio_format.sample_width,
+                ffmpeg_params=["-ac", str(audio_format.channels), "-ar", str(audio_format.sample_rate)],
+                verbose=False,
+                logger=None
+            )
+    except TranscriptionError:
+        raise
+    except Exception as e:
+        raise TranscriptionError(f"❌ خطأ في استخراج الصوت: {str(e)}")
+
+def get_ffmpeg_executable() -> str:
+    """Locate ffmpeg, preferring the binary bundled with imageio-ffmpeg"""
+    try:
+        import imageio_ffmpeg
+        return imageio_ffmpeg.get_ffmpeg_exe()
+    except Exception:
+        return "ffmpeg"
+
+def probe_media(media_path: str) -> Optional[MediaInfo]:
+    """Read the duration and stream types from ffmpeg's header dump, or None if ffmpeg cannot run"""
+    try:
+        result = subprocess.run([get_ffmpeg_executable(), "-hide_banner", "-i", media_path],
+                                capture_output=True, text=True, errors="replace")
+    except OSError:
+        return None
+    
+    duration = None
+    match = re.search(r"Duration:\s*(\d+):(\d+):(\d+(?:\.\d+)?)", result.stderr)
+    if match:
+        hours, minutes, seconds = match.groups()
+        duration = int(hours) * 3600 + int(minutes) * 60 + float(seconds)
+    
+    streams = re.findall(r"Stream #.*?: (Audio|Video): (.*)", result.stderr)
+    has_audio = any(kind == "Audio" for kind, _ in streams)
+    has_video = any(kind == "Video" and "(attached pic)" not in details for kind, details in streams)
+    return MediaInfo(duration, has_audio, has_video)
+
+def probe_duration(media_path: str) -> Optional[float]:
+    """Read the container duration in seconds from ffmpeg's header dump"""
+    info = probe_media(media_path)
+    return info.duration if info else None
+
+def is_audio_only(media_path: str, info: Optional[MediaInfo] = None) -> bool:
+    """True for audio file extensions and for containers (e.g. an .mp4) without a video stream"""
+    if os.path.splitext(media_path)[1].lower() in SUPPORTED_AUDIO_FORMATS:
+        return True
+    return info is not None and info.has_audio and not info.has_video
+
+def decode_audio_file(audio_path: str, output_path: str, audio_format: AudioFormat = DEFAULT_AUDIO_FORMAT):
+    """Decode an audio file to a WAV in audio_format with ffmpeg alone"""
+    sample_format = PCM_SAMPLE_FORMATS[audio_format.sample_width]
+    command = [
+        get_ffmpeg_executable(), "-nostdin", "-v", "error", "-y", "-i", audio_path,
+        "-vn", "-ac", str(audio_format.channels), "-ar", str(audio_format.sample_rate),
+        "-acodec", f"pcm_{sample_format}", "-f", "wav", output_path
+    ]
+    try:
+        result = subprocess.run(command, capture_output=True, text=True, errors="replace")
+    except OSError as e:
+        raise TranscriptionError(f"❌ خطأ في استخراج الصوت: {str(e)}")
+    if result.returncode != 0:
+        raise TranscriptionError(f"❌ خطأ في استخراج الصوت: {result.stderr.strip() or result.returncode}")
+
+def stream_audio_chunks(video_path: str, chunk_length_ms: int = 30000,
+                        audio_format: AudioFormat = DEFAULT_AUDIO_FORMAT, start_ms: int = 0,
+                        overlap_ms: int = 0) -> Iterator[PcmAudio]:
+    """Decode the audio track through an ffmpeg pipe, yielding fixed-length chunks as they arrive
+
+    A non-zero start_ms seeks in the input before decoding, so resuming a
+    long file does not decode the part already transcribed. With overlap_ms
+    each chunk also carries the start of the next one, so it is yielded
+    once that next chunk has been read.
+    """
+    sample_format = PCM_SAMPLE_FORMATS[audio_format.sample_width]
+    seek = ["-ss", f"{start_ms / 1000:.3f}"] if start_ms else []
+    command = [
+        get_ffmpeg_executable(), "-nostdin", "-v", "error",
+        *seek, "-i", video_path,
+        "-vn", "-ac", str(audio_format.channels), "-ar", str(audio_format.sample_rate),
+        "-f", sample_format, "-acodec", f"pcm_{sample_format}", "-"
+    ]
+    frame_width = audio_format.sample_width * audio_format.channels
+    bytes_per_chunk = audio_format.sample_rate * chunk_length_ms // 1000 * frame_width
+    overlap_bytes = audio_format.sample_rate * overlap_ms // 1000 * frame_width
+    
+    # ffmpeg's errors go to a file rather than a pipe nobody reads until the
+    # end, which would stall decoding once the pipe buffer filled up
+    stderr_file = tempfile.TemporaryFile(dir=SCRATCH_DIR)
+    try:
+        process = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=stderr_file)
+    except BaseException:
+        stderr_file.close()
+        raise
+    try:
+        start_frame = audio_format.sample_rate * start_ms // 1000
+        previous = b""
+        while True:
+            data = process.stdout.read(bytes_per_chunk)
+            if not data:
+                break
+            if previous:
+                chunk = PcmAudio(previous + data[:overlap_bytes], *audio_format, start_frame=start_frame)
+                start_frame += len(previous) // frame_width
+                yield chunk
+            previous = data
+        
+        if previous:
+            yield PcmAudio(previous, *audio_format, start_frame=start_frame)
+        
+        if process.wait() != 0:
+            stderr_file.seek(0)
+            stderr = stderr_file.read().decode(errors="replace").strip()
+            raise TranscriptionError(f"❌ خطأ في استخراج الصوت: {stderr or process.returncode}")
+    finally:
+        if process.poll() is None:
+            process.kill()
+            process.wait()
+        process.stdout.close()
+        stderr_file.close()
+
+def split_audio_into_chunks(audio_path: str, chunk_length_ms: int = 30000,
+                            audio_format: AudioFormat = DEFAULT_AUDIO_FORMAT, overlap_ms: int = 0) -> ChunkedAudio:
+    """Split audio into chunk spans over one shared buffer, materialized lazily
+
+    Silence splits already fall between words; overlap_ms only applies to
+    the time-based fallback.
+    """
+    try:
+        # No-op when extraction already produced the recognizer's format
+        audio = PcmAudio.from_wav(audio_path).convert(*audio_format)
+        
+        # Split on silence if possible, otherwise split by time
+        try:
+            spans = split_on_silence_ranges(
+                audio,
+                min_silence_len=1000,  # 1 second
+                silence_thresh=audio.dBFS - 14,
+                keep_silence=500
+            )
+            
+            # If no silence found, split by time
+            if len(spans) <= 1:
+                spans = audio.fixed_spans(chunk_length_ms, overlap_ms)
+                
+        except:
+            # Fallback to time-based splitting
+            spans = audio.fixed_spans(chunk_length_ms, overlap_ms)
+        
+        return ChunkedAudio(audio, spans)
+    except Exception as e:
+        raise TranscriptionError(f"❌ خطأ في تقسيم الصوت: {str(e)}")
+
+def as_languages(language: Union[str, Sequence[str]]) -> List[str]:
+    """Language codes of a run given one code or several"""
+    return [language] if isinstance(language, str) else list(language)
+
+def select_recognition(results: Sequence[Tuple[str, Optional[Recognition]]]) -> Optional[Tuple[str, Recognition]]:
+    """Pick the (language, recognition) to keep for a chunk recognized in several languages
+
+    Failed attempts (None) are ignored. Any text beats no speech, then the
+    highest confidence wins; ties, e.g. from backends without confidences,
+    go to the longer text and then to the earlier language. Returns None
+    when every language failed.
+    """
+    candidates = [(language, recognition) for language, recognition in results if recognition is not None]
+    if not candidates:
+        return None
+    return max(candidates, key=lambda candidate: (bool(candidate[1].text.strip()), candidate[1].confidence,
+                                                   len(candidate[1].text.split())))
+
+def transcribe_audio_chunk(audio_chunk: PcmAudio, language: str, backend: RecognizerBackend,
+                           warning_callback=None, retry_policy: Optional[RetryPolicy] = None,
+                           throttle: Optional[AdaptiveThrottle] = None,
+                           metrics: Optional[Metrics] = None) -> Optional[Recognition]:
+    """Transcribe a single audio chunk, retrying throttled and transient errors
+
+    Returns the text with its confidence, or None if recognition still
+    failed after the last attempt.
+    """
+    retry_policy = retry_policy or RetryPolicy()
+    metrics = metrics or Metrics()
+    attempt = 0
+    
+    while True:
+        attempt += 1
+        try:
+            with throttle.slot() if throttle else nullcontext():
+                with metrics.timer("recognize"):
+                    recognition = backend.transcribe_scored(audio_chunk, language)
+        except NoSpeechError:
+            recognition = Recognition("")  # No speech detected
+        except Exception as e:
+            error_class = classify_error(e)
+            metrics.inc(f"errors_{error_class}")
+            if throttle:
+                throttle.on_error(error_class)
+            if retry_policy.should_retry(error_class, attempt):
+                metrics.inc("retries")
+                logger.info("Retrying chunk after %s error (attempt %d): %s", error_class, attempt, e)
+                time.sleep(retry_policy.delay(attempt))
+                continue
+            
+            if isinstance(e, BackendError):
+                message = f"⚠️ خطأ في خدمة التعرف على الكلام بعد {attempt} محاولات: {str(e)}"
+            else:
+                message = f"⚠️ خطأ في معالجة الجزء: {str(e)}"
+            logger.warning(message)
+            if warning_callback:
+                warning_callback(message)
+            return None
+        
+        if throttle:
+            throttle.on_success()
+        return recognition
+
+def iter_transcribe_chunks(audio_chunks: Iterable[PcmAudio], language: Union[str, Sequence[str]],
+                           backend: RecognizerBackend,
+                           max_workers: int = DEFAULT_MAX_WORKERS, throttle: Optional[AdaptiveThrottle] = None,
+                           progress_callback=None, total_chunks: Optional[int] = None,
+                           cache: Optional[TranscriptCache] = None, warning_callback=None,
+                           checkpoint: Optional[Checkpoint] = None, failure_callback=None,
+                           retry_policy: Optional[RetryPolicy] = None,
+                           metrics: Optional[Metrics] = None, speech_filter: Optional[SpeechFilter] = None,
+                           skip_callback=None, tracker: Optional[ProgressTracker] = None,
+                           queue_size: int = DEFAULT_QUEUE_SIZE) -> Iterator[Segment]:
+    """Transcribe chunks on a thread pool, yielding each timed segment as soon as it is recognized
+
+    Segments arrive in completion order; sort by start for chunk order.
+    With several languages, each chunk is recognized in all of them in
+    parallel and the segment keeps the most confident result and its
+    language (see select_recognition).
+    Chunks are pulled from the iterable only while fewer than two per worker
+    are in flight, so a lazy source (e.g. stream_audio_chunks) is never read
+    far ahead of recognition. Cached chunks skip the throttle and backend.
+    Successfully recognized chunks are recorded in checkpoint, if given;
+    chunks that failed every attempt are yielded with empty text and also
+    passed to failure_callback. Chunks speech_filter rejects are never sent
+    to the backend; they are yielded with empty text and passed to
+    skip_callback as SkippedRange. The filter runs as its own stage, a
+    queue of at most queue_size chunks ahead of recognition. Chunk counts, cache hits, recognizer
+    latency, retries and backpressure waits are recorded in metrics.
+    Progress is reported through tracker, weighted by each chunk's
+    duration; without one, progress_callback gets a tracker of its own.
+    """
+    if total_chunks is None and hasattr(audio_chunks, "__len__"):
+        total_chunks = len(audio_chunks)
+    if tracker is None:
+        tracker = ProgressTracker(progress_callback, backend.name)
+        tracker.begin(audio_chunks.seconds if isinstance(audio_chunks, ChunkedAudio) else None)
+    
+    languages = as_languages(language)
+    metrics = metrics or Metrics()
+    max_workers = max(1, max_workers)
+    max_in_flight = 2 * max_workers
+    pending = set()
+    done = 0
+
+    def classify(chunk):
+        with metrics.timer("speech_filter"):
+            return chunk, speech_filter.classify(chunk)
+
+    def recognize(chunk, language_pool):
+        metrics.inc("chunks")
+        metrics.inc("audio_bytes", len(chunk.raw_data))
+        metrics.inc("audio_seconds", len(chunk) / 1000)
+        
+        # Decoded and filtered once, then fanned out to every language
+        if language_pool:
+            recognitions = language_pool.map(lambda chunk_language: recognize_language(chunk, chunk_language),
+                                             languages)
+        else:
+            recognitions = [recognize_language(chunk, languages[0])]
+        selected = select_recognition(list(zip(languages, recognitions)))
+        
+        if selected is None:
+            return Segment(chunk.start_seconds, chunk.end_seconds, "", languages[0]), False, None
+        chunk_language, recognition = selected
+        if len(languages) > 1:
+            metrics.inc(f"language_{chunk_language}")
+        return Segment(chunk.start_seconds, chunk.end_seconds, recognition.text.strip(), chunk_language), True, None
+
+    def recognize_language(chunk, chunk_language):
+        cache_key = None
+        if cache:
+            cache_key = cache.make_key(chunk.raw_data, chunk.frame_rate, chunk.sample_width,
+                                       chunk.channels, chunk_language, backend.name)
+            cached = cache.get_recognition(cache_key)
+            if cached is not None:
+                metrics.inc("cache_hits")
+                return cached
+            metrics.inc("cache_misses")
+
+        recognition = transcribe_audio_chunk(chunk, chunk_language, backend, warning_callback, retry_policy,
+                                             throttle, metrics)
+
+        # Failed chunks are not cached so they are retried on the next run
+        if recognition is None:
+            return None
+        if cache_key:
+            cache.put(cache_key, recognition.text, recognition.confidence)
+        return recognition
+
+    def finish(segment, recognized, skip_reason):
+        nonlocal done
+        done += 1
+        tracker.chunk_done(segment.end - segment.start,
+                           f"🔤 تمت معالجة {done} من {total_chunks} جزء..." if total_chunks
+                           else f"🔤 تمت معالجة {done} جزء...")
+        if skip_reason and skip_callback:
+            skip_callback(SkippedRange(segment.start, segment.end, skip_reason))
+        if checkpoint and recognized:
+            checkpoint.add(segment, skip_reason)
+        if not recognized:
+            metrics.inc("chunks_failed")
+            if failure_callback:
+                failure_callback(segment)
+        return segment
+
+    def collect(finished):
+        for future in finished:
+            pending.discard(future)
+            yield finish(*future.result())
+
+    if speech_filter:
+        classified = staged(map(classify, audio_chunks), queue_size, "speech_filter_queue", metrics)
+    else:
+        classified = ((chunk, None) for chunk in audio_chunks)
+
+    # The throttle, not the pool sizes, bounds how many requests run at once
+    language_pool = ThreadPoolExecutor(max_workers=max_workers * len(languages)) if len(languages) > 1 else None
+    with ThreadPoolExecutor(max_workers=max_workers) as executor, language_pool or nullcontext():
+        try:
+            for chunk, skip_reason in classified:
+                if skip_reason:
+                    metrics.inc("chunks_skipped")
+                    yield finish(Segment(chunk.start_seconds, chunk.end_seconds, "", languages[0]), True,
+                                 skip_reason)
+                    continue
+                
+                if len(pending) >= max_in_flight:
+                    with metrics.timer("backpressure_wait"):
+                        finished = wait(pending, return_when=FIRST_COMPLETED).done
+                    yield from collect(finished)
+                pending.add(executor.submit(recognize, chunk, language_pool))
+        finally:
+            # Stops the upstream stages when the caller gives up early
+            classified.close()
+
+        while pending:
+            yield from collect(wait(pending, return_when=FIRST_COMPLETED).done)
+
+def transcribe_chunks(audio_chunks: Iterable[PcmAudio], language: Union[str, Sequence[str]],
+                      backend: RecognizerBackend,
+                      *args, **kwargs) -> List[Segment]:
+    """Transcribe chunks on a thread pool, returning one timed segment per chunk in order"""
+    segments = iter_transcribe_chunks(audio_chunks, language, backend, *args, **kwargs)
+    return sorted(segments, key=lambda segment: segment.start)
+
+def iter_transcription(video_path: str, language: Union[str, Sequence[str]], chunk_duration: int,
+                       progress_callback=None, max_workers: int = DEFAULT_MAX_WORKERS,
+                       requests_per_second: float = DEFAULT_REQUESTS_PER_SECOND,
+                       backend: Optional[RecognizerBackend] = None, streaming: bool = True,
+                       cache: Optional[TranscriptCache] = None, warning_callback=None,
+                       resumable: bool = False, failure_callback=None,
+                       metrics: Optional[Metrics] = None, overlap: float = 0.0,
+                       speech_filter: bool = True, skip_callback=None,
+                       queue_size: int = DEFAULT_QUEUE_SIZE) -> Iterator[Segment]:
+    """Transcribe a video or audio file on disk, yielding segments as chunks are recognized
+
+    language is one code or several: with several, audio is extracted and
+    split once and every chunk is recognized in each language, keeping the
+    most confident result per chunk.
+    A resumable run is always streamed in fixed windows and records finished
+    chunks in a checkpoint file: after a crash or restart those chunks are
+    yielded first, the skipped ones reported to skip_callback again, and
+    decoding resumes at the first missing one. The
+    checkpoint is deleted once the file is complete. With overlap (seconds)
+    fixed windows extend into the next one so words at the boundaries are
+    heard whole; see stitching.stitch_segments. With speech_filter, chunks of
+    silence, music or noise are skipped before recognition and reported to
+    skip_callback. When streaming, decoding, speech filtering and
+    recognition run as separate stages joined by queues of at most
+    queue_size chunks, so a slow recognizer throttles the decoder and a
+    job holds roughly 2 * queue_size + 2 * max_workers chunks in memory.
+    Stage timings go to metrics. Raises TranscriptionError with a user-facing message when a
+    stage fails.
+    """
+    metrics = metrics or Metrics()
+    
+    # A negative overlap would drop audio between windows, and one a whole
+    # window long would recognize every second at least twice
+    clamped = max(0.0, overlap) if overlap < chunk_duration else max(0.0, chunk_duration - 1.0)
+    if clamped != overlap:
+        logger.warning("Overlap %ss clamped to %ss for %ss chunks", overlap, clamped, chunk_duration)
+        overlap = clamped
+    
+    if backend is None:
+        try:
+            backend = get_backend()
+        except BackendError as e:
+            raise TranscriptionError(f"❌ تعذر تشغيل محرك التعرف على الكلام: {str(e)}")
+    
+    checkpoint = None
+    if resumable:
+        try:
+            checkpoint = Checkpoint.for_run(video_path, "+".join(as_languages(language)), backend.name,
+                                            chunk_duration, overlap)
+        except OSError as e:
+            raise TranscriptionError(f"❌ تعذر فتح ملف الاستئناف: {str(e)}")
+    
+    # Create temporary files
+    with tempfile.NamedTemporaryFile(delete=False, suffix='.wav', dir=SCRATCH_DIR) as temp_audio:
+        temp_audio_path = temp_audio.name
+    
+    # Progress weighted by audio duration, with an ETA from this backend's measured throughput
+    tracker = ProgressTracker(progress_callback, backend.name)
+    
+    completed = False
+    audio_chunks = None
+    try:
+        chunk_length_ms = chunk_duration * 1000
+        overlap_ms = int(overlap * 1000)
+        total_chunks = None
+        
+        with metrics.timer("probe"):
+            info = probe_media(video_path)
+        if info and info.has_video and not info.has_audio:
+            raise TranscriptionError("❌ الفيديو لا يحتوي على مسار صوتي")
+        duration = info.duration if info else None
+        # Audio files and audio-only containers never touch the video decoder or moviepy
+        audio_only = is_audio_only(video_path, info)
+        
+        if checkpoint:
+            # Resume after the chunks finished by an earlier, interrupted run
+            for index, segment in checkpoint.done.items():
+                if index in checkpoint.skipped and skip_callback:
+                    skip_callback(SkippedRange(segment.start, segment.end, checkpoint.skipped[index]))
+                yield segment
+            metrics.inc("chunks_resumed", len(checkpoint.done))
+            resume_index = checkpoint.resume_index
+            
+            if duration:
+                chunk_count = max(1, -(-int(duration * 1000) // chunk_length_ms))
+                total_chunks = chunk_count - len(checkpoint.done)
+                tracker.begin(duration + overlap * (chunk_count - 1))
+                tracker.resumed(sum(segment.end - segment.start for segment in checkpoint.done.values()))
+            tracker.report(f"🎵 استئناف المعالجة من الجزء {resume_index + 1}...")
+            
+            chunks = stream_audio_chunks(video_path, chunk_length_ms, backend.audio_format,
+                                         start_ms=resume_index * chunk_length_ms, overlap_ms=overlap_ms)
+            audio_chunks = staged((chunk for chunk in metrics.timed_iter("decode", chunks)
+                                   if checkpoint.index_of(chunk.start_seconds) not in checkpoint.done),
+                                  queue_size, "decode_queue", metrics)
+        elif streaming:
+            # Decode audio through ffmpeg and recognize chunks while extraction is still running
+            if duration:
+                total_chunks = max(1, -(-int(duration * 1000) // chunk_length_ms))
+                tracker.begin(duration + overlap * (total_chunks - 1))
+            tracker.report("🎵 قراءة الملف الصوتي (متدفق)..." if audio_only
+                           else "🎵 استخراج الصوت من الفيديو (متدفق)...")
+            
+            chunks = stream_audio_chunks(video_path, chunk_length_ms, backend.audio_format, overlap_ms=overlap_ms)
+            audio_chunks = staged(metrics.timed_iter("decode", chunks), queue_size, "decode_queue", metrics)
+        else:
+            tracker.begin(duration, extract=True)
+            if audio_only:
+                # Decode the audio file straight to the recognizer's format
+                tracker.report("🎵 تحويل الملف الصوتي...")
+                
+                with metrics.timer("extract"):
+                    decode_audio_file(video_path, temp_audio_path, backend.audio_format)
+            else:
+                # Extract audio from video
+                tracker.report("🎵 استخراج الصوت من الفيديو...")
+                
+                with metrics.timer("extract"):
+                    extract_audio_from_video(video_path, temp_audio_path, backend.audio_format)
+            
+            # Split audio into chunks
+            tracker.report("✂️ تقسيم الصوت إلى أجزاء...")
+            
+            with metrics.timer("split"):
+                audio_chunks = split_audio_into_chunks(temp_audio_path, chunk_length_ms, backend.audio_format,
+                                                       overlap_ms)
+            
+            if not audio_chunks:
+                raise TranscriptionError("❌ فشل في تقسيم الصوت")
+            # The chunks, overlaps included, are the recognition work
+            tracker.total_seconds = audio_chunks.seconds
+        
+        # Transcribe chunks concurrently, rate limited to avoid hitting API limits
+        tracker.start_stage("recognize")
+        tracker.report("🔤 التعرف على الكلام...")
+        
+        # Concurrency and request rate adapt to errors, up to the configured limits
+        throttle = AdaptiveThrottle(max_workers, requests_per_second)
+        yield from iter_transcribe_chunks(audio_chunks, language, backend, max_workers, throttle,
+                                          progress_callback, total_chunks, cache, warning_callback,
+                                          checkpoint, failure_callback, metrics=metrics,
+                                          speech_filter=SpeechFilter() if speech_filter else None,
+                                          skip_callback=skip_callback, tracker=tracker, queue_size=queue_size)
+        completed = True
+        tracker.finish()
+        
+    except TranscriptionError:
+        raise
+    except Exception as e:
+        raise TranscriptionError(f"❌ خطأ عام في المعالجة: {str(e)}")
+    
+    finally:
+        # Stop the decoder stage, and ffmpeg with it, if recognition ended early
+        if hasattr(audio_chunks, "close"):
+            audio_chunks.close()
+        if checkpoint:
+            checkpoint.close(remove=completed)
+        
+        # Clean up temporary files
+        try:
+            os.unlink(temp_audio_path)
+        except:
+            pass
+
+def transcribe_file(video_path: str, language: Union[str, Sequence[str]], chunk_duration: int,
+                    progress_callback=None, segment_callback=None, **options) -> Transcript:
+    """Transcribe a video or audio file on disk
+
+    segment_callback, if given, receives each segment as soon as it is
+    recognized. Chunks that failed every retry are listed in
+    Transcript.failed and chunks skipped as non-speech in
+    Transcript.skipped. Transcript.text is empty when no speech was found.
+    Raises TranscriptionError with a user-facing message when a stage fails.
+    """
+    segments = []
+    failed = []
+    skipped = []
+    for segment in iter_transcription(video_path, language, chunk_duration, progress_callback,
+                                      failure_callback=failed.append, skip_callback=skipped.append, **options):
+        segments.append(segment)
+        if segment_callback:
+            segment_callback(segment)
+    
+    if segments and len(failed) == len(segments):
+        raise TranscriptionError("❌ فشل التعرف على الكلام في جميع الأجزاء")
+    
+    warning_callback = options.get("warning_callback")
+    if segments and len(skipped) == len(segments) and warning_callback:
+        warning_callback("🔇 لم يُعثر على كلام: كل الأجزاء صمت أو موسيقى أو ضوضاء")
+    
+    if progress_callback:
+        progress_callback(95, "📝 تجميع النص النهائي...")
+    
+    # Combine all text parts in chunk order, merging the words overlapping windows share
+    segments.sort(key=lambda segment: segment.start)
+    segments = stitch_segments(segments)
+    full_transcript = " ".join(segment.text for segment in segments if segment.text)
+    
+    if progress_callback:
+        progress_callback(100, "✅ تم الانتهاء!")
+    
+    failed.sort(key=lambda segment: segment.start)
+    skipped.sort(key=lambda skipped_range: skipped_range.start)
+    return Transcript(full_transcript.strip(), segments, failed, skipped)
+
+def create_json_content(transcript: Transcript, file: str, language: Union[str, Sequence[str]], backend: str,
+                        chunk_duration: int, warnings: List[str], elapsed_seconds: float, metrics: dict) -> str:
+    """JSON export of a finished job, written by the CLI and served by the HTTP API"""
+    return json.dumps({
+        "file": file,
+        "language": language,
+        "backend": backend,
+        "chunk_duration": chunk_duration,
+        "transcript": transcript.text,
+        "segments": [segment._asdict() for segment in transcript.segments],
+        "failed_chunks": [segment._asdict() for segment in transcript.failed],
+        "skipped_chunks": [skipped_range._asdict() for skipped_range in transcript.skipped],
+        "warnings": warnings,
+        "elapsed_seconds": round(elapsed_seconds, 3),
+        "metrics": metrics,
+    }, ensure_ascii=False, indent=2)
+
+def transcribe_video(video_file, language: Union[str, Sequence[str]], chunk_duration: int,
+                     progress_callback=None, **options) -> Transcript:
+    """Main transcription function for an uploaded file object with name and read()
+
+    The upload is copied to the scratch directory in blocks so ffmpeg can
+    read it from disk without a second full copy in memory.
+    """
+    if hasattr(video_file, "seek"):
+        video_file.seek(0)
+    
+    suffix = os.path.splitext(video_file.name)[1]
+    with tempfile.NamedTemporaryFile(delete=False, suffix=suffix, dir=SCRATCH_DIR) as temp_video:
+        temp_video_path = temp_video.name
+        try:
+            shutil.copyfileobj(video_file, temp_video, COPY_BUFFER_SIZE)
+        except OSError as e:
+            os.unlink(temp_video_path)
+            raise TranscriptionError(f"❌ تعذر حفظ الملف المؤقت: {str(e)}")
+    
+    try:
+        return transcribe_file(temp_video_path, language, chunk_duration, progress_callback, **options)
+    finally:
+        try:
+            os.unlink(temp_video_path)
+        except:
+            pass